@@ -1,7 +1,10 @@
 """
 ASGI config for FootballPerformanceHub project.
 
-It exposes the ASGI callable as a module-level variable named ``application``.
+It exposes the ASGI callable as a module-level variable named ``application``:
+plain Django for HTTP, and the communication WebSocket routes (SimpleJWT
+authenticated, browser Origins checked against CORS_ALLOWED_ORIGINS) for
+WebSockets.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
@@ -13,4 +16,15 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "FootballPerformanceHub.settings")
 
-application = get_asgi_application()
+# Initialize Django before importing code that touches models
+django_asgi_app = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+
+from communication.middleware import FrontendOriginValidator, JWTAuthMiddleware  # noqa: E402
+from communication.routing import websocket_urlpatterns  # noqa: E402
+
+application = ProtocolTypeRouter({
+    "http": django_asgi_app,
+    "websocket": FrontendOriginValidator(JWTAuthMiddleware(URLRouter(websocket_urlpatterns))),
+})
@@ -47,6 +47,7 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt.token_blacklist', 
     'corsheaders',
     'django_filters',
+    'channels',
 
     # My apps (Order can matter for dependencies, but this is a good start)
     'users',
@@ -56,6 +57,8 @@ INSTALLED_APPS = [
     'calendar_events',
 
     'documents',
+    'performance',
+    'wellness',
 ]
 
 MIDDLEWARE = [
@@ -101,6 +104,51 @@ DATABASE_CONFIG['CONN_MAX_AGE'] = 600
 DATABASES = {
     'default': DATABASE_CONFIG
 }
+
+# Caches: 'series' holds performance ACWR / load series (performance.caching).
+# Set REDIS_URL to share it between workers (bound Redis with maxmemory and an
+# allkeys-lru policy); the in-process fallback is bounded by SERIES_CACHE_MAX_ENTRIES.
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    SERIES_CACHE = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': 'series',
+    }
+else:
+    SERIES_CACHE = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'performance-series',
+        'OPTIONS': {'MAX_ENTRIES': config('SERIES_CACHE_MAX_ENTRIES', default=5000, cast=int)},
+    }
+SERIES_CACHE['TIMEOUT'] = config('SERIES_CACHE_TIMEOUT', default=600, cast=int)
+# 'badges' holds each user's unread counts (communication.badges), deleted on new
+# announcements / messages / reads; the timeout bounds staleness from other changes.
+BADGES_CACHE = (
+    {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': REDIS_URL, 'KEY_PREFIX': 'badges'}
+    if REDIS_URL else
+    {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'communication-badges'}
+)
+BADGES_CACHE['TIMEOUT'] = config('BADGES_CACHE_TIMEOUT', default=300, cast=int)
+CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'series': SERIES_CACHE,
+    'badges': BADGES_CACHE,
+}
+
+# WebSockets (communication.consumers). The in-memory layer only fans out inside
+# one process, which is enough for a single ASGI server; with several workers set
+# REDIS_URL (needs channels_redis) so a message saved by one reaches sockets on all.
+ASGI_APPLICATION = 'FootballPerformanceHub.asgi.application'
+if REDIS_URL:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.core.RedisChannelLayer',
+            'CONFIG': {'hosts': [REDIS_URL], 'prefix': 'ws'},
+        },
+    }
+else:
+    CHANNEL_LAYERS = {'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
@@ -24,4 +24,6 @@ urlpatterns = [
     path("api/documents/", include("documents.urls")),
     path("api/communication/", include("communication.urls")),
     path("api/calendar/", include("calendar_events.urls")),
+    path("api/performance/", include("performance.urls")),
+    path("api/wellness/", include("wellness.urls")),
 ]
\ No newline at end of file
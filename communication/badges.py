@@ -0,0 +1,79 @@
+# communication/badges.py
+"""
+Unread badges for the app shell: unread announcements per team and unread
+messages per conversation, for one user.
+
+Two grouped queries (announcements over the user's active teams, messages past
+the user's read cursors), cached per user. Entries are deleted after commit
+when an announcement or message is added or removed for the user, when the
+user joins or leaves a conversation and when the user reads something; an
+entry computed for another set of active teams is recomputed.
+BADGES_CACHE_TIMEOUT bounds anything missed.
+"""
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef
+
+from teams.models import TeamMembership
+from .models import Announcement
+from .unread import unread_counts
+
+CACHE_ALIAS = 'badges'
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+def _badge_key(user_id):
+    return f'badges:{user_id}'
+
+
+def invalidate_badges(user_ids):
+    """
+    Drop the cached badges of these users, after the current transaction commits.
+    """
+    keys = [_badge_key(u) for u in set(user_ids)]
+    if keys:
+        transaction.on_commit(lambda: _cache().delete_many(keys))
+
+
+def invalidate_team_badges(team_id):
+    invalidate_badges(
+        TeamMembership.objects.filter(team_id=team_id, active=True).values_list('user_id', flat=True)
+    )
+
+
+def unread_announcement_counts(user, team_ids):
+    """
+    {team_id: announcements of the team `user` has not read}, zeros left out.
+    """
+    read = Announcement.read_by.through.objects.filter(announcement=OuterRef('pk'), customuser=user)
+    return dict(
+        Announcement.objects.filter(team_id__in=team_ids)
+        .exclude(Exists(read))
+        .values('team_id').annotate(n=Count('id'))
+        .values_list('team_id', 'n')
+    )
+
+
+def compute_badges(user, team_ids):
+    teams = unread_announcement_counts(user, team_ids) if team_ids else {}
+    conversations = {c: n for c, n in unread_counts(user).items() if n}
+    return {
+        'announcements': {'total': sum(teams.values()), 'teams': teams},
+        'messages': {'total': sum(conversations.values()), 'conversations': conversations},
+    }
+
+
+def unread_badges(user, team_ids):
+    """
+    compute_badges(user, team_ids), served from the per-user cache.
+    """
+    cache = _cache()
+    key = _badge_key(user.pk)
+    badges = cache.get(key)
+    if badges is None or badges.get('team_ids') != sorted(team_ids):
+        badges = {'team_ids': sorted(team_ids), **compute_badges(user, team_ids)}
+        cache.set(key, badges)
+    return {k: v for k, v in badges.items() if k != 'team_ids'}
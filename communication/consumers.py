@@ -0,0 +1,59 @@
+# communication/consumers.py
+import time
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .models import Conversation
+
+
+def conversation_group(conversation_id):
+    return f"conversation_{conversation_id}"
+
+
+@database_sync_to_async
+def is_participant(conversation_id, user):
+    return Conversation.objects.filter(pk=conversation_id, participants=user).exists()
+
+
+class ConversationConsumer(AsyncJsonWebsocketConsumer):
+    """
+    ws/conversations/<conversation_id>/?token=<access token>
+    Pushes {"type": "message.created", "message": {...MessageSerializer...}}
+    for every new Message of the conversation. Participants only; others are
+    closed with 4403 (4401 without a valid token). A participant removed
+    from the conversation is closed with 4403, and a socket whose token has
+    expired with 4401 instead of receiving its next message. Messages are
+    still sent with POST /api/communication/conversations/<id>/messages/.
+    """
+    async def connect(self):
+        user = self.user = self.scope.get("user")
+        self.conversation_id = self.scope["url_route"]["kwargs"]["conversation_id"]
+        self.group = conversation_group(self.conversation_id)
+        if user is None or not user.is_authenticated:
+            await self.close(code=4401)
+            return
+        if not await is_participant(self.conversation_id, user):
+            await self.close(code=4403)
+            return
+        await self.channel_layer.group_add(self.group, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code):
+        await self.channel_layer.group_discard(self.group, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        # Push-only channel; answer pings so clients can keep the socket alive
+        if content.get("type") == "ping":
+            await self.send_json({"type": "pong"})
+
+    async def message_created(self, event):
+        exp = self.scope.get("token_exp")
+        if exp is not None and exp <= time.time():
+            await self.close(code=4401)  # the client reconnects with a fresh token
+            return
+        await self.send_json({"type": "message.created", "message": event["message"]})
+
+    async def participants_removed(self, event):
+        if self.user.pk in event["users"]:
+            await self.close(code=4403)
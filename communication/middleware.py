@@ -0,0 +1,59 @@
+# communication/middleware.py
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.security.websocket import OriginValidator
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+
+@database_sync_to_async
+def user_for_token(raw_token):
+    """
+    (user, expiry as a UNIX timestamp) for an access token; (AnonymousUser, None)
+    when the token is not valid.
+    """
+    auth = JWTAuthentication()
+    try:
+        token = auth.get_validated_token(raw_token)
+        return auth.get_user(token), token["exp"]
+    except (InvalidToken, TokenError, AuthenticationFailed):  # bad token; inactive or deleted user
+        return AnonymousUser(), None
+
+
+class JWTAuthMiddleware:
+    """
+    Sets scope["user"] from a SimpleJWT access token, read from the `token`
+    query parameter (browsers cannot set headers on a WebSocket handshake) or
+    an `Authorization: Bearer <token>` header. AnonymousUser otherwise.
+    scope["token_exp"] holds the token's expiry (UNIX timestamp), None without one.
+    """
+    def __init__(self, inner):
+        self.inner = inner
+
+    async def __call__(self, scope, receive, send):
+        token = parse_qs(scope.get("query_string", b"").decode()).get("token", [None])[0]
+        if token is None:
+            header = dict(scope.get("headers", [])).get(b"authorization", b"").decode()
+            if header.lower().startswith("bearer "):
+                token = header[7:].strip()
+        user, exp = await user_for_token(token) if token else (AnonymousUser(), None)
+        scope = dict(scope, user=user, token_exp=exp)
+        return await self.inner(scope, receive, send)
+
+
+class FrontendOriginValidator(OriginValidator):
+    """
+    Browser handshakes must come from the SPA (settings.CORS_ALLOWED_ORIGINS)
+    or from the backend's own hosts (settings.ALLOWED_HOSTS). Handshakes
+    without an Origin header are native / mobile clients, which carry no
+    ambient browser credentials; they are let through and still need a token.
+    """
+    def __init__(self, application):
+        super().__init__(application, [*settings.CORS_ALLOWED_ORIGINS, *settings.ALLOWED_HOSTS])
+
+    def valid_origin(self, parsed_origin):
+        return parsed_origin is None or super().valid_origin(parsed_origin)
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-17 11:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communication', '0003_alter_announcement_sender'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation', 'timestamp', 'id'], name='communicati_convers_00a3f1_idx'),
+        ),
+    ]
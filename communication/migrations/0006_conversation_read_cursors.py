@@ -0,0 +1,64 @@
+# Generated by Django 5.2.7 on 2026-10-17 11:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def start_cursors_at_last_message(apps, schema_editor):
+    # Existing history counts as read; only messages from now on are unread
+    Conversation = apps.get_model('communication', 'Conversation')
+    ConversationParticipant = apps.get_model('communication', 'ConversationParticipant')
+    last = Conversation.objects.filter(pk=OuterRef('conversation_id'), last_message__isnull=False)
+    ConversationParticipant.objects.filter(conversation__last_message__isnull=False).update(
+        last_read_id=Subquery(last.values('last_message_id')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+    """
+    Turn the auto-created participants table into ConversationParticipant
+    (state only, the table and its rows stay as they are), then add the read
+    cursor column, started at each conversation's current last message.
+    """
+
+    dependencies = [
+        ('communication', '0005_conversation_last_message'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='ConversationParticipant',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('conversation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='communication.conversation')),
+                        ('user', models.ForeignKey(db_column='customuser_id', on_delete=django.db.models.deletion.CASCADE, related_name='conversation_memberships', to=settings.AUTH_USER_MODEL)),
+                    ],
+                    options={
+                        'db_table': 'communication_conversation_participants',
+                        'unique_together': {('conversation', 'user')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='conversation',
+                    name='participants',
+                    field=models.ManyToManyField(related_name='conversations', through='communication.ConversationParticipant', to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+            database_operations=[],
+        ),
+        migrations.AddField(
+            model_name='conversationparticipant',
+            name='last_read_id',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(start_cursors_at_last_message, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation', 'id'], name='communicati_convers_f657aa_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-17 11:49
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_read_count(apps, schema_editor):
+    Announcement = apps.get_model('communication', 'Announcement')
+    reads = (
+        Announcement.read_by.through.objects.filter(announcement=OuterRef('pk'))
+        .values('announcement').annotate(n=Count('*')).values('n')
+    )
+    Announcement.objects.update(read_count=Coalesce(Subquery(reads), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communication', '0006_conversation_read_cursors'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='announcement',
+            name='read_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_read_count, migrations.RunPython.noop),
+    ]
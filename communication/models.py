@@ -7,10 +7,18 @@ class Conversation(models.Model):
     is_group_chat = models.BooleanField(default=False)
     participants = models.ManyToManyField(
         settings.AUTH_USER_MODEL,
+        through='ConversationParticipant',
         related_name='conversations'
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Newest message, kept by communication.signals so inbox lists need no per-row lookup
+    last_message = models.ForeignKey(
+        'Message',
+        on_delete=models.SET_NULL,
+        null=True, blank=True,
+        related_name='+'
+    )
 
     class Meta:
         ordering = ['-updated_at']
@@ -23,6 +31,28 @@ class Conversation(models.Model):
             return f"DM: {self.participants.first().get_full_name()} - {self.participants.last().get_full_name()}"
         return f"Conversation {self.id}"
 
+class ConversationParticipant(models.Model):
+    """
+    A user's membership of a Conversation (the participants through table) with
+    their read cursor: messages from others with id > last_read_id are unread.
+    One row per participant, however long the conversation gets.
+    """
+    conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name='memberships')
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        db_column='customuser_id',  # column of the former auto-created table
+        related_name='conversation_memberships'
+    )
+    last_read_id = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = 'communication_conversation_participants'
+        unique_together = [('conversation', 'user')]
+
+    def __str__(self):
+        return f"{self.user} in {self.conversation_id} (read up to {self.last_read_id})"
+
 class Message(models.Model):
     sender = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -36,12 +66,16 @@ class Message(models.Model):
     )
     content = models.TextField()
     timestamp = models.DateTimeField(auto_now_add=True)
-    # is_read is typically tracked per-user, not on the message itself for simplicity in MVP.
-    # For a scalable solution, consider a `ReadReceipt` model (Message, User, timestamp).
-    # For MVP, we'll assume a message is 'read' once fetched by a participant.
+    # Read state lives on ConversationParticipant.last_read_id, not per message.
 
     class Meta:
         ordering = ['timestamp']
+        indexes = [
+            # Keyset pagination (communication.pagination.MessageKeysetPagination)
+            models.Index(fields=['conversation', 'timestamp', 'id']),
+            # Unread counts: messages past a participant's read cursor
+            models.Index(fields=['conversation', 'id']),
+        ]
 
     def __str__(self):
         return f"Message from {self.sender.email} in {self.conversation}"
@@ -68,6 +102,7 @@ class Announcement(models.Model):
         related_name='read_announcements',
         blank=True
     )
+    read_count = models.PositiveIntegerField(default=0)  # len(read_by), kept by communication.signals
 
     class Meta:
         ordering = ['-timestamp']
@@ -0,0 +1,90 @@
+# communication/pagination.py
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+
+class MessageKeysetPagination(BasePagination):
+    """
+    Keyset pagination over (timestamp, id), served by the
+    (conversation, timestamp, id) index: no COUNT and no OFFSET, so every page
+    costs the same however long the conversation is.
+
+    ?limit=N          the latest N messages
+    ?before=<cursor>  the N messages just older than the cursor (scrolling back)
+    ?after=<cursor>   the N messages just newer than the cursor (new messages)
+
+    Pages are always oldest first. The response carries `before` (cursor of
+    the first message, null once the start of the conversation is reached),
+    `after` (cursor of the last message, to fetch newer ones) and `has_more`
+    (more messages in the requested direction).
+    """
+    default_limit = 50
+    max_limit = 200
+    invalid_cursor_message = 'Invalid cursor'
+
+    @staticmethod
+    def encode_cursor(message):
+        raw = f"{message.timestamp.isoformat()}|{message.id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, value):
+        try:
+            raw = base64.urlsafe_b64decode(value + '=' * (-len(value) % 4)).decode()
+            timestamp, pk = raw.split('|')
+            return datetime.fromisoformat(timestamp), int(pk)
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            return self.default_limit
+        return max(1, min(limit, self.max_limit))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        limit = self.get_limit(request)
+        after, before = request.query_params.get('after'), request.query_params.get('before')
+        self.after_cursor = after
+
+        if after:
+            timestamp, pk = self.decode_cursor(after)
+            qs = queryset.filter(Q(timestamp__gt=timestamp) | Q(timestamp=timestamp, id__gt=pk))
+            page = list(qs.order_by('timestamp', 'id')[:limit + 1])
+            self.has_more = len(page) > limit
+            page = page[:limit]
+            # Anything at or before the cursor is older than this page
+            self.has_older = True
+        else:
+            if before:
+                timestamp, pk = self.decode_cursor(before)
+                queryset = queryset.filter(Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, id__lt=pk))
+            page = list(queryset.order_by('-timestamp', '-id')[:limit + 1])
+            self.has_more = self.has_older = len(page) > limit
+            page = page[:limit][::-1]
+        self.page = page
+        return page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'before': self.encode_cursor(self.page[0]) if self.page and self.has_older else None,
+            'after': self.encode_cursor(self.page[-1]) if self.page else self.after_cursor,
+            'has_more': self.has_more,
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'before': {'type': 'string', 'nullable': True},
+                'after': {'type': 'string', 'nullable': True},
+                'has_more': {'type': 'boolean'},
+                'results': schema,
+            },
+        }
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Conversation, Message, Announcement
+from users.models import CustomUser
 from users.serializers import UserProfileSerializer
 
 class MessageSerializer(serializers.ModelSerializer):
@@ -14,23 +15,31 @@ class MessageSerializer(serializers.ModelSerializer):
 
 
 class ConversationSerializer(serializers.ModelSerializer):
+    # Declared explicitly: DRF makes M2M fields with a custom through model read-only
+    participants = serializers.PrimaryKeyRelatedField(many=True, queryset=CustomUser.objects.all())
     participants_details = UserProfileSerializer(source='participants', many=True, read_only=True)
     last_message = serializers.SerializerMethodField()
+    unread_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Conversation
         fields = (
             'id', 'name', 'is_group_chat', 'participants',
-            'participants_details', 'created_at', 'updated_at', 'last_message'
+            'participants_details', 'created_at', 'updated_at', 'last_message', 'unread_count'
         )
-        read_only_fields = ('created_at', 'updated_at', 'last_message', 'participants_details')
+        read_only_fields = ('created_at', 'updated_at', 'last_message', 'participants_details', 'unread_count')
 
     def get_last_message(self, obj):
-        last_msg = obj.messages.order_by('-timestamp').first()
-        if last_msg:
-            return MessageSerializer(last_msg).data
+        # Denormalized pointer, kept by communication.signals
+        if obj.last_message_id:
+            return MessageSerializer(obj.last_message).data
         return None
 
+    def get_unread_count(self, obj):
+        # Filled in bulk by ConversationViewSet.list; null elsewhere
+        unread = self.context.get('unread')
+        return None if unread is None else unread.get(obj.id, 0)
+
     def validate(self, attrs):
         """
         Ensure all participants share at least one common active team.
@@ -71,15 +80,23 @@ class ConversationSerializer(serializers.ModelSerializer):
 class AnnouncementSerializer(serializers.ModelSerializer):
     sender_name = serializers.CharField(source='sender.get_full_name', read_only=True)
     team_name = serializers.CharField(source='team.name', read_only=True)
-    read_by_count = serializers.SerializerMethodField()
+    read_by_count = serializers.IntegerField(source='read_count', read_only=True)
+    read_by_me = serializers.SerializerMethodField()
 
     class Meta:
         model = Announcement
         fields = (
             'id', 'sender', 'sender_name', 'team', 'team_name', 'title',
-            'content', 'timestamp', 'is_urgent', 'read_by', 'read_by_count'
+            'content', 'timestamp', 'is_urgent', 'read_by', 'read_by_count', 'read_by_me'
         )
-        read_only_fields = ('sender', 'timestamp', 'read_by', 'read_by_count')
+        read_only_fields = ('sender', 'timestamp', 'read_by', 'read_by_count', 'read_by_me')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # The reader id list grows with the squad; only sent when asked for
+        if not self.context.get('include_read_by'):
+            self.fields.pop('read_by')
 
-    def get_read_by_count(self, obj):
-        return obj.read_by.count()
+    def get_read_by_me(self, obj):
+        # Annotated by AnnouncementViewSet.get_queryset
+        return bool(getattr(obj, 'read_by_me', False))
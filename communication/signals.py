@@ -0,0 +1,137 @@
+# communication/signals.py
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.db.models.signals import m2m_changed, post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .badges import invalidate_badges, invalidate_team_badges
+from .consumers import conversation_group
+from .models import Announcement, Conversation, ConversationParticipant, Message
+from .serializers import MessageSerializer
+
+
+def broadcast_message(message):
+    """
+    Push a saved Message to the sockets connected to its conversation.
+    """
+    layer = get_channel_layer()
+    if layer is None:
+        return
+    async_to_sync(layer.group_send)(
+        conversation_group(message.conversation_id),
+        {"type": "message.created", "message": MessageSerializer(message).data},
+    )
+
+
+def close_removed_participants(removed):
+    """
+    Close the sockets of users taken out of conversations;
+    `removed` maps conversation id -> user ids.
+    """
+    layer = get_channel_layer()
+    if layer is None:
+        return
+    for conversation_id, user_ids in removed.items():
+        async_to_sync(layer.group_send)(
+            conversation_group(conversation_id),
+            {"type": "participants.removed", "users": list(user_ids)},
+        )
+
+
+def refresh_last_message(conversation_ids, **fields):
+    """
+    Point Conversation.last_message at the newest message (timestamp, id),
+    read from the table inside the same UPDATE rather than taken from the caller.
+    """
+    latest = Message.objects.filter(conversation=OuterRef('pk')).order_by('-timestamp', '-id')
+    return Conversation.objects.filter(pk__in=conversation_ids).update(
+        last_message=Subquery(latest.values('id')[:1]), **fields,
+    )
+
+
+def invalidate_participant_badges(conversation_id):
+    invalidate_badges(
+        ConversationParticipant.objects.filter(conversation_id=conversation_id).values_list('user_id', flat=True)
+    )
+
+
+@receiver(post_save, sender=Message)
+def on_message_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        # Also bumps the conversation to the top of the inbox
+        refresh_last_message([instance.conversation_id], updated_at=timezone.now())
+        invalidate_participant_badges(instance.conversation_id)
+        # Only committed messages reach the sockets
+        transaction.on_commit(lambda: broadcast_message(instance))
+
+
+@receiver(post_delete, sender=Message)
+def on_message_deleted(sender, instance, **kwargs):
+    # SET_NULL has already cleared the pointer if this was the last message
+    refresh_last_message([instance.conversation_id])
+    invalidate_participant_badges(instance.conversation_id)
+
+
+@receiver(m2m_changed, sender=Conversation.participants.through)
+def on_participants_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    # Either side of the relation: conversation.participants / user.conversations
+    if action in ('post_add', 'post_remove'):
+        invalidate_badges([instance.pk] if reverse else pk_set)
+    elif action == 'pre_clear':
+        # pk_set is None for clear(); note who leaves which conversations first
+        pk_set = set(instance.conversations.values_list('id', flat=True) if reverse
+                     else instance.participants.values_list('id', flat=True))
+        invalidate_badges([instance.pk] if reverse else pk_set)
+    if action in ('post_remove', 'pre_clear') and pk_set:
+        removed = {c: [instance.pk] for c in pk_set} if reverse else {instance.pk: pk_set}
+        # Removed participants stop receiving messages once the removal commits
+        transaction.on_commit(lambda: close_removed_participants(removed))
+
+
+@receiver(post_save, sender=Announcement)
+def on_announcement_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        invalidate_team_badges(instance.team_id)
+
+
+@receiver(post_delete, sender=Announcement)
+def on_announcement_deleted(sender, instance, **kwargs):
+    invalidate_team_badges(instance.team_id)
+
+
+def refresh_read_counts(announcement_ids):
+    """
+    Recount Announcement.read_count from read_by for the given announcements,
+    in one UPDATE with a grouped subquery.
+    """
+    reads = (
+        Announcement.read_by.through.objects.filter(announcement=OuterRef('pk'))
+        .values('announcement').annotate(n=Count('*')).values('n')
+    )
+    return Announcement.objects.filter(pk__in=announcement_ids).update(
+        read_count=Coalesce(Subquery(reads), Value(0)),
+    )
+
+
+@receiver(m2m_changed, sender=Announcement.read_by.through)
+def on_announcement_reads_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    # Either side of the relation: announcement.read_by / user.read_announcements
+    if action == 'pre_clear':
+        # pk_set is None for clear(); note which announcements / readers are affected
+        if reverse:
+            instance._cleared_announcements = list(
+                sender.objects.filter(customuser=instance).values_list('announcement_id', flat=True)
+            )
+        else:
+            invalidate_badges(instance.read_by.values_list('id', flat=True))
+    elif action in ('post_add', 'post_remove'):
+        refresh_read_counts(pk_set if reverse else [instance.pk])
+        invalidate_badges([instance.pk] if reverse else pk_set)
+    elif action == 'post_clear':
+        refresh_read_counts(getattr(instance, '_cleared_announcements', []) if reverse else [instance.pk])
+        if reverse:
+            invalidate_badges([instance.pk])
@@ -1,3 +1,98 @@
-from django.test import TestCase
+import time
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.conf import settings
+from django.test import TransactionTestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from FootballPerformanceHub.asgi import application
+from users.models import CustomUser
+from .models import Conversation, Message
+
+
+class ConversationSocketHandshakeTests(TransactionTestCase):
+    """
+    Handshakes through the full ASGI stack: origin check, JWT auth, consumer.
+    """
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            email='ws@example.com', password='x', first_name='Web', last_name='Socket', role='PLAYER',
+        )
+        self.conversation = Conversation.objects.create()
+        self.conversation.participants.add(self.user)
+        self.token = str(AccessToken.for_user(self.user))
+
+    async def connect(self, origin=None):
+        headers = [(b'origin', origin.encode())] if origin else []
+        communicator = WebsocketCommunicator(
+            application, f'/ws/conversations/{self.conversation.id}/?token={self.token}', headers=headers,
+        )
+        result = await communicator.connect()
+        await communicator.disconnect()
+        return result
+
+    async def test_frontend_origin_connects(self):
+        connected, _ = await self.connect(origin=settings.CORS_ALLOWED_ORIGINS[0])
+        self.assertTrue(connected)
+
+    async def test_native_client_without_origin_connects(self):
+        connected, _ = await self.connect()
+        self.assertTrue(connected)
+
+    async def test_foreign_origin_is_refused(self):
+        connected, _ = await self.connect(origin='https://evil.example.com')
+        self.assertFalse(connected)
+
+    async def test_inactive_user_token_is_closed_4401(self):
+        self.user.is_active = False
+        await self.user.asave(update_fields=['is_active'])
+        connected, code = await self.connect(origin=settings.CORS_ALLOWED_ORIGINS[0])
+        self.assertFalse(connected)
+        self.assertEqual(code, 4401)
+
+
+class ConversationSocketMembershipTests(TransactionTestCase):
+    """
+    Open sockets follow the conversation's membership and the token's lifetime.
+    """
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            email='ws@example.com', password='x', first_name='Web', last_name='Socket', role='PLAYER',
+        )
+        self.other = CustomUser.objects.create_user(
+            email='ws2@example.com', password='x', first_name='Other', last_name='Socket', role='PLAYER',
+        )
+        self.conversation = Conversation.objects.create()
+        self.conversation.participants.add(self.user, self.other)
+
+    async def open(self, user):
+        communicator = WebsocketCommunicator(
+            application, f'/ws/conversations/{self.conversation.id}/?token={AccessToken.for_user(user)}',
+        )
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        return communicator
+
+    async def test_removed_participant_is_closed_4403(self):
+        removed, kept = await self.open(self.user), await self.open(self.other)
+        await sync_to_async(self.conversation.participants.remove)(self.user)
+        self.assertEqual(await removed.receive_output(), {'type': 'websocket.close', 'code': 4403})
+        self.assertTrue(await kept.receive_nothing())
+        await kept.disconnect()
+
+    async def test_cleared_from_user_side_is_closed_4403(self):
+        removed = await self.open(self.user)
+        await sync_to_async(self.user.conversations.clear)()
+        self.assertEqual(await removed.receive_output(), {'type': 'websocket.close', 'code': 4403})
+
+    async def test_expired_token_is_closed_4401_instead_of_pushed(self):
+        communicator = await self.open(self.user)
+        # The consumer's clock only: the in-memory channel layer expires messages by time.time too
+        with mock.patch('communication.consumers.time') as clock:
+            clock.time.return_value = time.time() + 86400 * 365
+            await sync_to_async(Message.objects.create)(
+                sender=self.other, conversation=self.conversation, content='hi',
+            )
+            self.assertEqual(await communicator.receive_output(), {'type': 'websocket.close', 'code': 4401})
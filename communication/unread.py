@@ -0,0 +1,45 @@
+# communication/unread.py
+"""
+Read cursors: each ConversationParticipant keeps the id of the last message it
+has read. Unread = messages from other participants past that id, counted for
+all of a user's conversations in one grouped query over the
+(conversation, id) index. Marking read is a single-row UPDATE.
+"""
+from django.db.models import Count, F, FilteredRelation, Q
+from django.db.models.functions import Greatest
+
+from .models import ConversationParticipant
+
+
+def unread_counts(user, conversation_ids=None):
+    """
+    {conversation_id: unread messages} for every conversation `user` takes
+    part in (or only `conversation_ids`), zeros included.
+    """
+    qs = ConversationParticipant.objects.filter(user=user)
+    if conversation_ids is not None:
+        qs = qs.filter(conversation_id__in=conversation_ids)
+    return dict(
+        qs.annotate(unread_messages=FilteredRelation(
+            'conversation__messages',
+            condition=Q(conversation__messages__id__gt=F('last_read_id'))
+            & ~Q(conversation__messages__sender=user),
+        ))
+        .values('conversation_id')
+        .annotate(unread=Count('unread_messages'))
+        .values_list('conversation_id', 'unread')
+    )
+
+
+def mark_read(user, conversation, message_id=None):
+    """
+    Move `user`'s cursor in `conversation` to message_id (default: the
+    conversation's last message). Never moves backwards. Returns the number
+    of rows updated: 0 when the user is not a participant.
+    """
+    target = conversation.last_message_id or 0
+    if message_id is not None:
+        target = min(message_id, target)
+    return ConversationParticipant.objects.filter(conversation=conversation, user=user).update(
+        last_read_id=Greatest(F('last_read_id'), target),
+    )
@@ -1,7 +1,7 @@
 # communication/urls.py
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ConversationViewSet, MessageListView, AnnouncementViewSet
+from .views import ConversationViewSet, MessageListView, AnnouncementViewSet, UnreadBadgeView
 
 router = DefaultRouter()
 router.register(r'conversations', ConversationViewSet, basename='conversation')
@@ -10,10 +10,12 @@ router.register(r'announcements', AnnouncementViewSet, basename='announcement')
 urlpatterns = [
     path('', include(router.urls)),
     path('conversations/<int:conversation_id>/messages/', MessageListView.as_view(), name='message_list'),
+    path('badges/', UnreadBadgeView.as_view(), name='unread_badges'),
     # REMOVE manual add_participants path — router now exposes:
     #   POST /communication/conversations/{pk}/add_participants/
     # Router also exposes:
     #   POST /communication/conversations/start_dm/
-    # For announcements mark-as-read we keep:
-    path('announcements/<int:pk>/read/', AnnouncementViewSet.mark_as_read, name='announcement_mark_as_read'),
+    # Announcement actions are router actions too:
+    #   POST /communication/announcements/{pk}/read/
+    #   POST /communication/announcements/read-all/
 ]
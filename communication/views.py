@@ -28,10 +28,15 @@ from rest_framework import viewsets, generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
-from django.db.models import Q, Count
+from django.db import transaction
+from django.db.models import Q, Count, Exists, OuterRef, Prefetch
 from django.shortcuts import get_object_or_404
 
 from .models import Conversation, Message, Announcement
+from .pagination import MessageKeysetPagination
+from .badges import invalidate_badges, unread_badges
+from .signals import refresh_read_counts
+from .unread import mark_read, unread_counts
 from .serializers import ConversationSerializer, MessageSerializer, AnnouncementSerializer
 from users.permissions import IsCoachOrAdmin, IsTeamMember
 
@@ -52,8 +57,51 @@ class ConversationViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        # Users see only conversations they participate in
-        return self.queryset.filter(participants=self.request.user)
+        # Users see only conversations they participate in. Participants and the
+        # denormalized last message are loaded up front: a constant number of
+        # queries per page.
+        return (
+            self.queryset.filter(participants=self.request.user)
+            .select_related('last_message__sender')
+            .prefetch_related('participants')
+        )
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        rows = page if page is not None else list(queryset)
+        # Unread counts for the whole page in one grouped query
+        context = {**self.get_serializer_context(), "unread": unread_counts(request.user, [c.id for c in rows])}
+        serializer = self.get_serializer(rows, many=True, context=context)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=["get"], url_path="unread")
+    def unread(self, request):
+        """Unread message counts of every conversation of the requester, in one query."""
+        counts = unread_counts(request.user)
+        return Response({
+            "total": sum(counts.values()),
+            "conversations": {cid: n for cid, n in counts.items() if n},
+        })
+
+    @action(detail=True, methods=["post"], url_path="read")
+    def read(self, request, pk=None):
+        """
+        Move the requester's read cursor to {"message": <id>}, or to the last
+        message when omitted. One UPDATE; the cursor never moves backwards.
+        """
+        conv = get_object_or_404(Conversation.objects.filter(participants=request.user), pk=pk)
+        message_id = request.data.get("message")
+        if message_id is not None:
+            try:
+                message_id = int(message_id)
+            except (TypeError, ValueError):
+                return Response({"detail": "message must be a message id."}, status=400)
+        mark_read(request.user, conv, message_id)
+        invalidate_badges([request.user.id])
+        return Response({"conversation": conv.id, "last_read_id": conv.memberships.get(user=request.user).last_read_id})
 
     def perform_create(self, serializer):
         # Ensure creator is a participant
@@ -131,14 +179,21 @@ class ConversationViewSet(viewsets.ModelViewSet):
         if not valid_new:
             return Response({"detail": "No candidates share an active team with you."}, status=400)
 
-        conv.participants.add(*valid_new)
+        # Newcomers start with the existing history read
+        conv.participants.add(*valid_new, through_defaults={"last_read_id": conv.last_message_id or 0})
         conv.save(update_fields=["updated_at"])
         return Response(ConversationSerializer(conv).data, status=200)
 
 
 class MessageListView(generics.ListCreateAPIView):
+    """
+    GET /api/communication/conversations/<conversation_id>/messages/?limit=&before=&after=
+    Keyset-paginated on (timestamp, id); see MessageKeysetPagination. Poll
+    with ?after=<last cursor> (or use the WebSocket) to get only new messages.
+    """
     serializer_class = MessageSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = MessageKeysetPagination
 
     def get_queryset(self):
         conversation_id = self.kwargs['conversation_id']
@@ -146,16 +201,28 @@ class MessageListView(generics.ListCreateAPIView):
         # Ensure user is a participant of the conversation
         if not conversation.participants.filter(id=self.request.user.id).exists():
             self.permission_denied(self.request, message="You are not a participant of this conversation.")
-        return Message.objects.filter(conversation=conversation).order_by('timestamp')
+        return Message.objects.filter(conversation=conversation).select_related('sender')
 
     def perform_create(self, serializer):
         conversation_id = self.kwargs['conversation_id']
         conversation = get_object_or_404(Conversation, pk=conversation_id)
         if not conversation.participants.filter(id=self.request.user.id).exists():
             self.permission_denied(self.request, message="You are not a participant of this conversation.")
+        # communication.signals moves last_message and updated_at
         serializer.save(sender=self.request.user, conversation=conversation)
-        # Update conversation's updated_at to bring it to top of list
-        conversation.save()
+
+class UnreadBadgeView(generics.GenericAPIView):
+    """
+    GET /api/communication/badges/
+    Unread announcements per active team and unread messages per conversation
+    of the requester, with totals. Two grouped queries, cached per user until
+    something relevant changes (communication.badges).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        return Response(unread_badges(request.user, active_team_ids(request.user)))
+
 
 class AnnouncementViewSet(viewsets.ModelViewSet):
     queryset = Announcement.objects.all()
@@ -163,11 +230,29 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-    # Users can see announcements for any team they actively belong to
+        # Users can see announcements for any team they actively belong to.
+        # read_by_me is an EXISTS per row; read_count is a stored counter.
         team_ids = active_team_ids(self.request.user)
-        if team_ids:
-          return self.queryset.filter(team_id__in=team_ids).order_by("-timestamp")
-        return self.queryset.none()
+        if not team_ids:
+            return self.queryset.none()
+        qs = (
+            self.queryset.filter(team_id__in=team_ids)
+            .select_related("sender", "team")
+            .annotate(read_by_me=Exists(Announcement.read_by.through.objects.filter(
+                announcement=OuterRef("pk"), customuser=self.request.user,
+            )))
+            .order_by("-timestamp")
+        )
+        if self.include_read_by():
+            qs = qs.prefetch_related(Prefetch("read_by", queryset=CustomUser.objects.only("id")))
+        return qs
+
+    def include_read_by(self):
+        # The reader id list grows with the squad; only on ?include=read_by
+        return "read_by" in self.request.query_params.get("include", "").split(",")
+
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), "include_read_by": self.include_read_by()}
 
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
@@ -203,8 +288,43 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
             serializer.save(sender=user, team=team)
     
 
-    # Custom action to mark an announcement as read
+    @action(detail=True, methods=["post"], url_path="read")
     def mark_as_read(self, request, pk=None):
+        """Mark one announcement read by the requester; returns the counter only."""
         announcement = get_object_or_404(self.get_queryset(), pk=pk)
-        announcement.read_by.add(request.user)
-        return Response(AnnouncementSerializer(announcement).data, status=status.HTTP_200_OK)
\ No newline at end of file
+        announcement.read_by.add(request.user)  # counter kept by communication.signals
+        announcement.refresh_from_db(fields=["read_count"])
+        return Response(
+            {"id": announcement.id, "read_count": announcement.read_count, "read_by_me": True},
+            status=status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=["post"], url_path="read-all")
+    def mark_all_as_read(self, request):
+        """
+        Mark every announcement of {"team": <id>} read by the requester: one
+        INSERT of the missing read rows and one counter UPDATE, whatever the count.
+        """
+        team_id = request.data.get("team") or request.query_params.get("team")
+        try:
+            team_id = int(team_id)
+        except (TypeError, ValueError):
+            return Response({"detail": "team is required."}, status=400)
+        if team_id not in active_team_ids(request.user):
+            return Response({"detail": "You are not an active member of this team."}, status=403)
+
+        unread = list(
+            Announcement.objects.filter(team_id=team_id)
+            .exclude(read_by=request.user)
+            .values_list("id", flat=True)
+        )
+        Reads = Announcement.read_by.through
+        with transaction.atomic():
+            Reads.objects.bulk_create(
+                [Reads(announcement_id=a, customuser_id=request.user.id) for a in unread],
+                ignore_conflicts=True,
+            )
+            # bulk_create sends no m2m_changed; recount and drop the badge explicitly
+            refresh_read_counts(unread)
+            invalidate_badges([request.user.id])
+        return Response({"team": team_id, "marked": len(unread)}, status=status.HTTP_200_OK)
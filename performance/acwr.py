@@ -1,7 +1,17 @@
 # performance/acwr.py
 import math
-from datetime import date, timedelta
+from datetime import timedelta
+
+import numpy as np
+from django.db.models import Max, Q
+
+from .caching import invalidate_members
 from .models import DailyLoad, LoadACWR
+from .series import add_range, refresh_series
+
+ACUTE_HALFLIFE_DAYS = 7     # acute half-life ~7d
+CHRONIC_HALFLIFE_DAYS = 28  # chronic half-life ~28d
+UPSERT_BATCH_SIZE = 1000
 
 def ewma(prev, x_t, alpha):
     return alpha * x_t + (1 - alpha) * prev
@@ -9,26 +19,233 @@ def ewma(prev, x_t, alpha):
 def alpha_from_halflife(hl_days):
     return 1 - math.exp(math.log(0.5) / hl_days)
 
+def ewma_rows(X, alpha, initial):
+    """
+    `ewma` along the day axis of X (members, days), row i seeded with
+    initial[i]: one vectorized step per day across every member. Each step is
+    the same float expression as `ewma`, so values are bit-identical to the
+    day-by-day loop.
+    """
+    X = np.asarray(X, dtype=float)
+    out = np.empty_like(X)
+    prev = np.array(initial, dtype=float)
+    for t in range(X.shape[1]):
+        prev = out[:, t] = ewma(prev, X[:, t], alpha)
+    return out
+
+def ewma_series(x, alpha, initial=0.0):
+    """
+    `ewma` over a whole daily series, seeded with `initial`; exact, see ewma_rows.
+    """
+    return ewma_rows(np.asarray(x, dtype=float)[None, :], alpha, [initial])[0]
+
+def compute_acwr_rows(X, acute0, chronic0):
+    """
+    (acute, chronic, ratio) matrices for daily loads X (members, days) from
+    per-member EWMA states. ratio is 0.0 wherever chronic is not positive.
+    """
+    acute = ewma_rows(X, alpha_from_halflife(ACUTE_HALFLIFE_DAYS), acute0)
+    chronic = ewma_rows(X, alpha_from_halflife(CHRONIC_HALFLIFE_DAYS), chronic0)
+    ratio = np.divide(acute, chronic, out=np.zeros_like(acute), where=chronic > 0)
+    return acute, chronic, ratio
+
+def compute_acwr_series(x, acute0=0.0, chronic0=0.0):
+    """
+    Returns (acute, chronic, ratio) arrays for the daily loads `x`.
+    ratio is 0.0 wherever chronic is not positive.
+    """
+    acute, chronic, ratio = compute_acwr_rows(np.asarray(x, dtype=float)[None, :], [acute0], [chronic0])
+    return acute[0], chronic[0], ratio[0]
+
+def ewma_matrix(X, alpha, initial):
+    """
+    EWMA of every row of X (members, days), each seeded with initial[i], in
+    closed form: s_t = (1-a)^(t+1) s_0 + sum_k a (1-a)^(t-k) x_k, i.e. one
+    matrix product for the whole squad. Equal to running `ewma` day by day only
+    up to float rounding, so it serves projections; stored ACWR uses ewma_rows.
+    """
+    t = np.arange(X.shape[1])
+    lag = t[:, None] - t[None, :]
+    W = np.where(lag >= 0, alpha * (1 - alpha) ** np.maximum(lag, 0), 0.0)
+    return np.asarray(initial, dtype=float)[:, None] * (1 - alpha) ** (t + 1) + X @ W.T
+
+def project_acwr(X, acute0, chronic0):
+    """
+    (acute, chronic, ratio) matrices for planned daily loads X (members, days)
+    from per-member EWMA states; same ratio convention as compute_acwr_series.
+    """
+    acute = ewma_matrix(X, alpha_from_halflife(ACUTE_HALFLIFE_DAYS), acute0)
+    chronic = ewma_matrix(X, alpha_from_halflife(CHRONIC_HALFLIFE_DAYS), chronic0)
+    ratio = np.divide(acute, chronic, out=np.zeros_like(acute), where=chronic > 0)
+    return acute, chronic, ratio
+
+def load_series(membership_id, start_date, end_date):
+    """
+    Dense daily internal load for [start_date, end_date] from a single query.
+    Days without a DailyLoad row are 0.
+    """
+    x = np.zeros((end_date - start_date).days + 1, dtype=float)
+    rows = (
+        DailyLoad.objects
+        .filter(membership_id=membership_id, date__range=(start_date, end_date))
+        .values_list('date', 'internal_load_au')
+    )
+    for d, load in rows:
+        x[(d - start_date).days] = load
+    return x
+
+def acwr_rows(membership_id, start_date, acute, chronic, ratio, source="INTERNAL"):
+    """
+    Unsaved LoadACWR rows, one per day starting at start_date.
+    """
+    return [
+        LoadACWR(
+            membership_id=membership_id, date=start_date + timedelta(days=i), source=source,
+            acute_ewma=a, chronic_ewma=c, ratio=r,
+        )
+        for i, (a, c, r) in enumerate(zip(acute.tolist(), chronic.tolist(), ratio.tolist()))
+    ]
+
+def upsert_acwr(rows):
+    LoadACWR.objects.bulk_create(
+        rows,
+        batch_size=UPSERT_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['membership', 'date', 'source'],
+        update_fields=['acute_ewma', 'chronic_ewma', 'ratio', 'updated_at'],
+    )
+    invalidate_members({r.membership_id for r in rows})
+    # Keep the packed season series in step with every write, not only the signal flush
+    ranges = {}
+    for r in rows:
+        if r.source == "INTERNAL":
+            add_range(ranges, r.membership_id, r.date, r.date)
+    refresh_series('acwr', ranges)
+    return len(rows)
+
+def write_acwr(membership_id, start_date, acute, chronic, ratio, source="INTERNAL"):
+    """
+    Upsert one LoadACWR row per day starting at start_date, in bulk.
+    """
+    return upsert_acwr(acwr_rows(membership_id, start_date, acute, chronic, ratio, source))
+
+def _recompute(membership_id, start_date, end_date, acute0=0.0, chronic0=0.0):
+    if end_date < start_date:
+        return 0
+    x = load_series(membership_id, start_date, end_date)
+    acute, chronic, ratio = compute_acwr_series(x, acute0, chronic0)
+    return write_acwr(membership_id, start_date, acute, chronic, ratio)
+
 def compute_acwr_for_member(membership_id, start_date, end_date):
-    a_alpha = alpha_from_halflife(7)   # acute half-life ~7d
-    c_alpha = alpha_from_halflife(28)  # chronic half-life ~28d
-
-    # Iterate dates; pull loads (missing -> 0)
-    d = start_date
-    acute = 0.0
-    chronic = 0.0
-
-    # warm-up: backfill some history if you have it (optional)
-
-    while d <= end_date:
-        dl = DailyLoad.objects.filter(membership_id=membership_id, date=d).first()
-        x = (dl.internal_load_au if dl else 0)
-        acute = ewma(acute, x, a_alpha)
-        chronic = ewma(chronic, x, c_alpha)
-        ratio = (acute / chronic) if chronic > 0 else 0.0
-
-        LoadACWR.objects.update_or_create(
-            membership_id=membership_id, date=d, source="INTERNAL",
-            defaults=dict(acute_ewma=acute, chronic_ewma=chronic, ratio=ratio)
+    """
+    Recompute INTERNAL ACWR for one member over [start_date, end_date]:
+    one DailyLoad SELECT, one vectorized pass, one bulk upsert.
+    EWMA state starts at 0.0 on start_date.
+    """
+    return _recompute(membership_id, start_date, end_date)
+
+def last_state_before(membership_id, day, source="INTERNAL"):
+    """
+    (date, acute_ewma, chronic_ewma) of the latest stored LoadACWR row before
+    `day` (normally the day before), or None.
+    """
+    return (
+        LoadACWR.objects
+        .filter(membership_id=membership_id, source=source, date__lt=day)
+        .order_by('-date')
+        .values_list('date', 'acute_ewma', 'chronic_ewma')
+        .first()
+    )
+
+def series_end(membership_id, day):
+    """
+    Last day the member's ACWR series should cover: the latest DailyLoad or
+    LoadACWR date, and never earlier than `day`.
+    """
+    last_load = DailyLoad.objects.filter(membership_id=membership_id).aggregate(d=Max('date'))['d']
+    last_acwr = LoadACWR.objects.filter(membership_id=membership_id, source="INTERNAL").aggregate(d=Max('date'))['d']
+    return max(d for d in (day, last_load, last_acwr) if d is not None)
+
+def recompute_acwr_from(membership_id, changed_date, end_date=None):
+    """
+    Incremental ACWR after a DailyLoad change on `changed_date`.
+
+    Resumes from the EWMA state stored for the day before and recomputes
+    forward only, so the cost is O(days since change). Without stored state
+    it starts from the member's first DailyLoad day with a 0.0 state, which
+    is what a full recompute would do.
+    """
+    state = last_state_before(membership_id, changed_date)
+    if state:
+        prev_date, acute0, chronic0 = state
+        start_date = prev_date + timedelta(days=1)
+    else:
+        first_load = (
+            DailyLoad.objects.filter(membership_id=membership_id)
+            .order_by('date').values_list('date', flat=True).first()
         )
-        d += timedelta(days=1)
+        start_date = min(first_load, changed_date) if first_load else changed_date
+        acute0 = chronic0 = 0.0
+
+    if end_date is None:
+        end_date = series_end(membership_id, changed_date)
+    return _recompute(membership_id, start_date, end_date, acute0, chronic0)
+
+def recompute_acwr_for_members(changes):
+    """
+    Batched recompute_acwr_from for {membership_id: changed_date}.
+
+    Members whose day-before state is stored (the normal case) share a
+    constant number of queries and a single bulk upsert, whatever the squad
+    size. The rest fall back to recompute_acwr_from one by one.
+    """
+    if not changes:
+        return 0
+    day_before = Q()
+    for membership_id, changed_date in changes.items():
+        day_before |= Q(membership_id=membership_id, date=changed_date - timedelta(days=1))
+    states = {
+        m: (a, c)
+        for m, a, c in LoadACWR.objects.filter(day_before, source="INTERNAL")
+        .values_list('membership_id', 'acute_ewma', 'chronic_ewma')
+    }
+
+    written = sum(recompute_acwr_from(m, d) for m, d in changes.items() if m not in states)
+    if not states:
+        return written
+
+    ids = list(states)
+    ends = {}
+    for model in (DailyLoad, LoadACWR):
+        qs = model.objects.filter(membership_id__in=ids)
+        if model is LoadACWR:
+            qs = qs.filter(source="INTERNAL")
+        for row in qs.values('membership_id').annotate(d=Max('date')):
+            ends[row['membership_id']] = max(ends.get(row['membership_id'], row['d']), row['d'])
+
+    loads = {}
+    for m, d, load in (
+        DailyLoad.objects
+        .filter(membership_id__in=ids, date__gte=min(changes[m] for m in ids))
+        .values_list('membership_id', 'date', 'internal_load_au')
+    ):
+        loads.setdefault(m, []).append((d, load))
+
+    # One (members, days) matrix, each row starting on its own changed date;
+    # rows shorter than the longest are zero-padded at the end and cut off again.
+    spans = {m: (changes[m], max(changes[m], ends.get(m, changes[m]))) for m in ids}
+    X = np.zeros((len(ids), max((end - start).days + 1 for start, end in spans.values())))
+    row_of = {m: i for i, m in enumerate(ids)}
+    for m in ids:
+        start_date, end_date = spans[m]
+        for d, load in loads.get(m, ()):
+            if start_date <= d <= end_date:
+                X[row_of[m], (d - start_date).days] = load
+    acute, chronic, ratio = compute_acwr_rows(X, [states[m][0] for m in ids], [states[m][1] for m in ids])
+
+    rows = []
+    for m in ids:
+        start_date, end_date = spans[m]
+        i, n = row_of[m], (end_date - start_date).days + 1
+        rows += acwr_rows(m, start_date, acute[i, :n], chronic[i, :n], ratio[i, :n])
+    return written + upsert_acwr(rows)
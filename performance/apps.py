@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class PerformanceConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "performance"
+
+    def ready(self):
+        # Import signals so they get registered
+        from . import signals  # noqa
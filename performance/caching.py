@@ -0,0 +1,100 @@
+# performance/caching.py
+"""
+Read-through cache for per-member and per-team ACWR / load series.
+
+Every entry key embeds the data version of each member it covers (one member,
+or a whole squad) plus the date range. Writes to DailyLoad / LoadACWR replace
+the version of the touched members once the transaction commits, so exactly
+their entries, and the team entries that include them, stop being
+addressable; the backend's bounded culling / LRU reclaims them. Versions are
+random tokens, so an evicted version can never resurrect an old entry.
+
+Hit / miss counters live in the same cache so every worker contributes.
+"""
+import hashlib
+import uuid
+
+from django.core.cache import caches
+from django.db import transaction
+
+CACHE_ALIAS = 'series'
+STATS_KEYS = {'hits': 'perf:stats:hits', 'misses': 'perf:stats:misses'}
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+def _version_key(membership_id):
+    return f'perf:v:{membership_id}'
+
+
+def member_versions(membership_ids):
+    """
+    {membership_id: version token}, creating tokens for members never seen (or evicted).
+    """
+    cache = _cache()
+    keys = {_version_key(m): m for m in membership_ids}
+    found = cache.get_many(list(keys))
+    versions = {keys[k]: v for k, v in found.items()}
+    for key, m in keys.items():
+        if m not in versions:
+            token = uuid.uuid4().hex
+            # add() keeps a token another worker created meanwhile
+            versions[m] = token if cache.add(key, token, timeout=None) else cache.get(key, token)
+    return versions
+
+
+def invalidate_members(membership_ids):
+    """
+    Retire every cached series of these members, after the current transaction commits.
+    """
+    membership_ids = set(membership_ids)
+    if not membership_ids:
+        return
+
+    def bump():
+        token = uuid.uuid4().hex
+        _cache().set_many({_version_key(m): token for m in membership_ids}, timeout=None)
+
+    transaction.on_commit(bump)
+
+
+def _count(stat):
+    cache = _cache()
+    try:
+        cache.incr(STATS_KEYS[stat])
+    except ValueError:  # counter not set yet (or evicted)
+        if not cache.add(STATS_KEYS[stat], 1, timeout=None):
+            cache.incr(STATS_KEYS[stat])
+
+
+def cached_series(kind, membership_ids, start, end, compute, extra=()):
+    """
+    compute() for (kind, members, [start, end], extra), served from the cache
+    while none of the members' data changed.
+    """
+    versions = member_versions(membership_ids)
+    raw = '|'.join(map(str, (kind, start, end, *extra, *(f'{m}:{versions[m]}' for m in membership_ids))))
+    key = f'perf:{kind}:{hashlib.md5(raw.encode()).hexdigest()}'
+    cache = _cache()
+    value = cache.get(key)
+    if value is not None:
+        _count('hits')
+        return value
+    _count('misses')
+    value = compute()
+    cache.set(key, value)
+    return value
+
+
+def cache_stats():
+    found = _cache().get_many(list(STATS_KEYS.values()))
+    stats = {name: found.get(key, 0) for name, key in STATS_KEYS.items()}
+    total = stats['hits'] + stats['misses']
+    stats['hit_ratio'] = round(stats['hits'] / total, 4) if total else None
+    return stats
+
+
+def reset_cache_stats():
+    _cache().delete_many(list(STATS_KEYS.values()))
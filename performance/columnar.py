@@ -0,0 +1,69 @@
+# performance/columnar.py
+"""
+Helpers for columnar (members x days) payloads: a shared date axis plus one
+array per member per metric, with explicit nulls for missing days.
+"""
+import hashlib
+from datetime import timedelta
+
+import numpy as np
+from django.utils import timezone
+from django.utils.cache import quote_etag
+from django.utils.dateparse import parse_date
+
+MAX_RANGE_DAYS = 731
+
+
+def date_range_from_request(request, default_days, season=None):
+    """
+    (start, end) from ?from=&to= (YYYY-MM-DD). Defaults to the season's dates when
+    given, otherwise the last `default_days` days up to today.
+    Raises ValueError on bad input.
+    """
+    params = request.query_params
+    end = parse_date(params["to"]) if params.get("to") else (season.end_date if season else timezone.localdate())
+    start = parse_date(params["from"]) if params.get("from") else (
+        season.start_date if season else end - timedelta(days=default_days - 1)
+    )
+    if start is None or end is None:
+        raise ValueError("Dates must be YYYY-MM-DD.")
+    if start > end:
+        raise ValueError("'from' must be on or before 'to'.")
+    if (end - start).days + 1 > MAX_RANGE_DAYS:
+        raise ValueError(f"Range is limited to {MAX_RANGE_DAYS} days.")
+    return start, end
+
+
+def date_axis(start, end, step_days=1):
+    return [start + timedelta(days=i) for i in range(0, (end - start).days + 1, step_days)]
+
+
+def dense_matrix(rows, member_ids, start, n_days, n_metrics, step_days=1):
+    """
+    rows: iterable of (member_id, date, metric_1, ..., metric_n).
+    Returns a float array of shape (n_metrics, members, days), NaN where missing.
+    With step_days=7 the axis is weeks counted from `start`.
+    """
+    index = {m: i for i, m in enumerate(member_ids)}
+    out = np.full((n_metrics, len(member_ids), n_days), np.nan)
+    for member_id, day, *values in rows:
+        i = index.get(member_id)
+        j = (day - start).days // step_days
+        if i is not None and 0 <= j < n_days:
+            out[:, i, j] = [np.nan if v is None else v for v in values]
+    return out
+
+
+def matrix_to_json(arr, decimals=None):
+    """
+    Nested lists with None for NaN, optionally rounded.
+    """
+    if decimals is not None:
+        arr = np.round(arr, decimals)
+    obj = arr.astype(object)
+    obj[np.isnan(arr)] = None
+    return obj.tolist()
+
+
+def etag_for(*parts):
+    return quote_etag(hashlib.md5("|".join(map(str, parts)).encode()).hexdigest())
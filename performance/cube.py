@@ -0,0 +1,241 @@
+# performance/cube.py
+"""
+Multi-granularity load cube (LoadRollup), maintained hierarchically:
+
+    DailyLoad -> MEMBER week / month -> MEMBER season (full months + edge days)
+              -> LINE / TEAM rows of the same grain and period
+
+Weeks straddle month boundaries, so months are summed from DailyLoad rather
+than from weeks; seasons reuse the month rows. All measures are additive, so any
+date range can be answered from the coarsest rows that tile it (see
+range_totals) instead of scanning DailyLoad.
+"""
+import calendar
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+
+from teams.models import Season, TeamMembership
+from .models import DailyLoad, LoadRollup
+
+UPSERT_BATCH_SIZE = 1000
+MEASURES = ('internal_load_au', 'external_load_pl', 'sessions', 'duration_min', 'active_days')
+
+
+def week_bounds(day):
+    start = day - timedelta(days=day.weekday())
+    return start, start + timedelta(days=6)
+
+
+def month_bounds(day):
+    start = day.replace(day=1)
+    return start, day.replace(day=calendar.monthrange(day.year, day.month)[1])
+
+
+def full_months(start, end):
+    """
+    (first_day, last_day) of the run of whole calendar months inside [start, end],
+    or None when no month fits entirely.
+    """
+    lo = start if start.day == 1 else month_bounds(start)[1] + timedelta(days=1)
+    hi = end if end == month_bounds(end)[1] else end.replace(day=1) - timedelta(days=1)
+    return (lo, hi) if lo <= hi else None
+
+
+def _daily_measures():
+    # active_days first: its filter must see the column, not the SUM annotation below
+    return dict(
+        active_days=Count('id', filter=Q(internal_load_au__gt=0)),
+        internal_load_au=Sum('internal_load_au'),
+        external_load_pl=Sum('external_load_pl'),
+        sessions=Sum('sessions'),
+        duration_min=Sum('duration_min'),
+    )
+
+
+def _rollup_measures():
+    return {f: Sum(f) for f in MEASURES}
+
+
+def _member_rows_from_daily(grain, ids, periods, team_of):
+    trunc, bounds = (TruncWeek, week_bounds) if grain == LoadRollup.WEEK else (TruncMonth, month_bounds)
+    lo = min(periods)
+    hi = bounds(max(periods))[1]
+    return [
+        LoadRollup(
+            grain=grain, scope=LoadRollup.MEMBER, period_start=r['period'], period_end=bounds(r['period'])[1],
+            team_id=team_of[r['membership_id']], membership_id=r['membership_id'],
+            **{f: r[f] or 0 for f in MEASURES},
+        )
+        for r in (
+            DailyLoad.objects
+            .filter(membership_id__in=ids, date__range=(lo, hi))
+            .annotate(period=trunc('date'))
+            .filter(period__in=periods)
+            .values('membership_id', 'period')
+            .annotate(**_daily_measures())
+        )
+    ]
+
+
+def _member_season_rows(season, ids, team_of):
+    """
+    Season totals per member: MONTH rows for whole months, DailyLoad for the edges.
+    """
+    totals = defaultdict(lambda: dict.fromkeys(MEASURES, 0))
+    months = full_months(season.start_date, season.end_date)
+    if months:
+        month_q = LoadRollup.objects.filter(
+            grain=LoadRollup.MONTH, scope=LoadRollup.MEMBER, membership_id__in=ids,
+            period_start__gte=months[0], period_end__lte=months[1],
+        )
+        edge = Q(date__lt=months[0]) | Q(date__gt=months[1])
+        for r in month_q.values('membership_id').annotate(**_rollup_measures()):
+            for f in MEASURES:
+                totals[r['membership_id']][f] += r[f] or 0
+    else:
+        edge = Q()
+    daily_q = DailyLoad.objects.filter(edge, membership_id__in=ids, date__range=(season.start_date, season.end_date))
+    for r in daily_q.values('membership_id').annotate(**_daily_measures()):
+        for f in MEASURES:
+            totals[r['membership_id']][f] += r[f] or 0
+    return [
+        LoadRollup(
+            grain=LoadRollup.SEASON, scope=LoadRollup.MEMBER, period_start=season.start_date,
+            period_end=season.end_date, season=season, team_id=team_of[m], membership_id=m, **values,
+        )
+        for m, values in totals.items()
+    ]
+
+
+def _group_rows(grain, team_ids, periods):
+    """
+    LINE and TEAM rows for every team x period, summed from MEMBER rows.
+    """
+    qs = LoadRollup.objects.filter(
+        grain=grain, scope=LoadRollup.MEMBER, team_id__in=team_ids, period_start__in=periods,
+        membership__role_on_team='PLAYER',
+    )
+    keys = ('team_id', 'period_start', 'period_end', 'season_id')
+    measures = dict(_rollup_measures(), members=Count('id'))
+    rows = [
+        LoadRollup(grain=grain, scope=LoadRollup.TEAM, **{k: r[k] for k in keys}, **{f: r[f] for f in (*MEASURES, 'members')})
+        for r in qs.values(*keys).annotate(**measures)
+    ]
+    rows += [
+        LoadRollup(
+            grain=grain, scope=LoadRollup.LINE, line=r['membership__primary_position__line'],
+            **{k: r[k] for k in keys}, **{f: r[f] for f in (*MEASURES, 'members')},
+        )
+        for r in qs.values(*keys, 'membership__primary_position__line').annotate(**measures)
+        if r['membership__primary_position__line']
+    ]
+    return rows
+
+
+def _replace(grain, scopes, rows, **filters):
+    LoadRollup.objects.filter(grain=grain, scope__in=scopes, **filters).delete()
+    LoadRollup.objects.bulk_create(rows, batch_size=UPSERT_BATCH_SIZE)
+
+
+def refresh_load_cube(pairs):
+    """
+    Rebuild every cube cell touched by changed DailyLoad (membership_id, date)
+    pairs: member weeks and months, then member seasons, then the line / team
+    rows of those periods.
+    """
+    pairs = set(pairs)
+    if not pairs:
+        return
+    ids = {m for m, _ in pairs}
+    team_of = dict(TeamMembership.objects.filter(id__in=ids).values_list('id', 'team_id'))
+    team_ids = set(team_of.values())
+    dates = [d for _, d in pairs]
+    seasons = [
+        s for s in Season.objects.filter(start_date__lte=max(dates), end_date__gte=min(dates))
+        if any(s.start_date <= d <= s.end_date for d in dates)
+    ]
+
+    with transaction.atomic():
+        for grain, bounds in ((LoadRollup.WEEK, week_bounds), (LoadRollup.MONTH, month_bounds)):
+            periods = {bounds(d)[0] for d in dates}
+            # Rebuild the whole members x periods block so deleted days do not linger
+            _replace(grain, [LoadRollup.MEMBER], _member_rows_from_daily(grain, ids, periods, team_of),
+                     membership_id__in=ids, period_start__in=periods)
+            _replace(grain, [LoadRollup.LINE, LoadRollup.TEAM], _group_rows(grain, team_ids, periods),
+                     team_id__in=team_ids, period_start__in=periods)
+
+        for season in seasons:
+            _replace(LoadRollup.SEASON, [LoadRollup.MEMBER], _member_season_rows(season, ids, team_of),
+                     membership_id__in=ids, season=season)
+        if seasons:
+            periods = {s.start_date for s in seasons}
+            _replace(LoadRollup.SEASON, [LoadRollup.LINE, LoadRollup.TEAM],
+                     _group_rows(LoadRollup.SEASON, team_ids, periods),
+                     team_id__in=team_ids, period_start__in=periods)
+
+
+def _grouped(qs, key, measures):
+    if key:
+        return qs.values(key).annotate(**measures)
+    return [qs.aggregate(**measures)]
+
+
+def range_totals(team_id, scope, start, end):
+    """
+    Additive totals over [start, end] for one team, keyed by membership id
+    (MEMBER), position line (LINE) or 'ALL' (TEAM). Uses SEASON rows for whole
+    seasons inside the range, MONTH rows for the remaining whole months and
+    DailyLoad only for the leftover edge days.
+    """
+    totals = defaultdict(lambda: dict.fromkeys(MEASURES, 0))
+
+    def add(rows, key):
+        for r in rows:
+            k = r[key] if key else 'ALL'
+            if k in (None, '') or all(r[f] is None for f in MEASURES):
+                continue
+            for f in MEASURES:
+                totals[k][f] += r[f] or 0
+
+    key = {LoadRollup.MEMBER: 'membership_id', LoadRollup.LINE: 'line'}.get(scope)
+    rollups = LoadRollup.objects.filter(team_id=team_id, scope=scope)
+
+    # Whole seasons first, then whole months in the gaps, then the edge days
+    seasons, gaps, cursor = [], [], start
+    for s in Season.objects.filter(start_date__gte=start, end_date__lte=end).order_by('start_date'):
+        if s.start_date < cursor:  # overlapping seasons: the earlier one wins
+            continue
+        if cursor < s.start_date:
+            gaps.append((cursor, s.start_date - timedelta(days=1)))
+        seasons.append(s)
+        cursor = s.end_date + timedelta(days=1)
+    if cursor <= end:
+        gaps.append((cursor, end))
+    if seasons:
+        add(_grouped(rollups.filter(grain=LoadRollup.SEASON, season__in=seasons), key, _rollup_measures()), key)
+
+    month_q, edge_q = Q(), Q()
+    for lo, hi in gaps:
+        months = full_months(lo, hi)
+        if months:
+            month_q |= Q(period_start__gte=months[0], period_end__lte=months[1])
+            if lo < months[0]:
+                edge_q |= Q(date__range=(lo, months[0] - timedelta(days=1)))
+            if months[1] < hi:
+                edge_q |= Q(date__range=(months[1] + timedelta(days=1), hi))
+        else:
+            edge_q |= Q(date__range=(lo, hi))
+    if month_q:
+        add(_grouped(rollups.filter(month_q, grain=LoadRollup.MONTH), key, _rollup_measures()), key)
+
+    if edge_q:
+        daily = DailyLoad.objects.filter(edge_q, membership__team_id=team_id)
+        if scope != LoadRollup.MEMBER:
+            daily = daily.filter(membership__role_on_team='PLAYER')
+        daily_key = {LoadRollup.MEMBER: 'membership_id', LoadRollup.LINE: 'membership__primary_position__line'}.get(scope)
+        add(_grouped(daily, daily_key, _daily_measures()), daily_key)
+    return dict(totals)
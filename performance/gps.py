@@ -0,0 +1,166 @@
+# performance/gps.py
+"""
+Streaming importer for Catapult / STATSports session CSV exports.
+
+Files are read row by row (never fully in memory) and PlayerLoad is summed per
+(provider athlete id, date). Athlete ids map to TeamMembership through
+LinkedDevice.external_user_id, and the totals land in DailyLoad.external_load_pl
+with one bulk upsert. Days present in an import are replaced, so re-importing the
+same exports is idempotent; pass every export of a day in the same import.
+"""
+import csv
+import io
+import math
+from collections import defaultdict
+from datetime import datetime
+
+from django.db import transaction
+
+from .caching import invalidate_members
+from .cube import refresh_load_cube
+from .integrations import ExternalProvider, LinkedDevice
+from .models import DailyLoad
+from .series import add_range, refresh_series
+
+UPSERT_BATCH_SIZE = 1000
+HEADER_SCAN_ROWS = 20  # exports often start with a few metadata lines
+
+# Accepted header names per provider (compared lower-cased and stripped)
+PROVIDER_COLUMNS = {
+    ExternalProvider.CATAPULT: {
+        "athlete": ("athlete id", "athlete_id", "player id"),
+        "date": ("date", "session date", "start date"),
+        "load": ("total player load", "player load", "playerload"),
+    },
+    ExternalProvider.STATSPORTS: {
+        "athlete": ("player id", "player_id", "athlete id"),
+        "date": ("session date", "date"),
+        "load": ("total loading", "dynamic stress load", "player load"),
+    },
+}
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y")
+
+
+def parse_date(value):
+    value = value.strip().replace("T", " ").split(" ")[0]
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def find_columns(reader, wanted, label, optional=()):
+    """
+    Consume rows until the header line; returns {key: column index} for `wanted`
+    ({key: header aliases}). Keys listed in `optional` may map to None.
+    """
+    for _, row in zip(range(HEADER_SCAN_ROWS), reader):
+        names = [c.strip().lower() for c in row]
+        cols = {}
+        for key, aliases in wanted.items():
+            cols[key] = next((names.index(a) for a in aliases if a in names), None)
+        if all(idx is not None for key, idx in cols.items() if key not in optional):
+            return cols
+    required = ", ".join(k for k in wanted if k not in optional)
+    raise ValueError(f"No {label} header with {required} columns found.")
+
+
+def aggregate_player_load(stream, provider, totals=None, stats=None):
+    """
+    Stream one text CSV export and add its PlayerLoad into totals[(athlete_id, date)].
+    """
+    if provider not in PROVIDER_COLUMNS:
+        raise ValueError(f"Unsupported GPS provider: {provider}")
+    totals = defaultdict(float) if totals is None else totals
+    stats = {"rows": 0, "skipped": 0} if stats is None else stats
+
+    reader = csv.reader(stream)
+    cols = find_columns(reader, PROVIDER_COLUMNS[provider], provider)
+    a_idx, d_idx, l_idx = cols["athlete"], cols["date"], cols["load"]
+    width = max(a_idx, d_idx, l_idx)
+    for row in reader:
+        if len(row) <= width:
+            stats["skipped"] += 1
+            continue
+        athlete = row[a_idx].strip()
+        day = parse_date(row[d_idx])
+        try:
+            load = float(row[l_idx])
+        except ValueError:
+            load = None
+        if load is not None and not math.isfinite(load):  # "nan" / "inf" parse as floats
+            load = None
+        if not athlete or day is None or load is None:
+            stats["skipped"] += 1
+            continue
+        totals[(athlete, day)] += load
+        stats["rows"] += 1
+    return totals, stats
+
+
+def map_athletes(provider, athletes, team_ids=None):
+    """
+    {external_user_id: membership_id} through LinkedDevice, in one query.
+    With team_ids, only memberships of those teams are returned.
+    """
+    devices = LinkedDevice.objects.filter(provider=provider, external_user_id__in=set(athletes))
+    if team_ids is not None:
+        devices = devices.filter(membership__team_id__in=team_ids)
+    # Prefer the active, most recent membership when a device was relinked
+    return dict(
+        devices.order_by("membership__active", "membership_id").values_list("external_user_id", "membership_id")
+    )
+
+
+def write_external_load(provider, totals, team_ids=None):
+    """
+    Map athlete ids to memberships and upsert DailyLoad.external_load_pl.
+    With team_ids, only memberships of those teams are written.
+    """
+    athletes = {a for a, _ in totals}
+    membership_by_athlete = map_athletes(provider, athletes, team_ids)
+
+    per_day = defaultdict(float)
+    for (athlete, day), load in totals.items():
+        membership_id = membership_by_athlete.get(athlete)
+        if membership_id:
+            per_day[(membership_id, day)] += load
+
+    # One transaction: a failing import leaves no half-written days behind
+    with transaction.atomic():
+        DailyLoad.objects.bulk_create(
+            [DailyLoad(membership_id=m, date=d, external_load_pl=max(0, round(load)))
+             for (m, d), load in per_day.items()],
+            batch_size=UPSERT_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["membership", "date"],
+            update_fields=["external_load_pl"],
+        )
+        # bulk upserts fire no post_save; the cube and the season series carry external load
+        refresh_load_cube(per_day)
+        ranges = {}
+        for m, d in per_day:
+            add_range(ranges, m, d, d)
+        refresh_series("load", ranges)
+        invalidate_members({m for m, _ in per_day})
+    return {
+        "member_days": len(per_day),
+        "unmatched_athletes": sorted(athletes - set(membership_by_athlete)),
+    }
+
+
+def import_gps_exports(provider, files, team_ids=None):
+    """
+    Import binary file objects (paths opened in "rb" or uploads) of one provider.
+    Returns a summary dict.
+    """
+    totals, stats = defaultdict(float), {"rows": 0, "skipped": 0}
+    for fh in files:
+        text = io.TextIOWrapper(fh, encoding="utf-8-sig", newline="")
+        try:
+            aggregate_player_load(text, provider, totals, stats)
+        finally:
+            text.detach()  # leave the caller's file open
+    return {**stats, **write_external_load(provider, totals, team_ids)}
@@ -0,0 +1,192 @@
+# performance/hrv.py
+"""
+Bulk HRV ingestion for WHOOP / Oura exports into DailyHRV.
+
+Exports are streamed, rMSSD is averaged per athlete per day, ln_rMSSD is computed
+vectorized and every row is written with one bulk upsert. The rolling 7-day
+ln_rMSSD baseline (mean, SD, CV) is then refreshed for the affected days and the
+6 days after them, so readiness views read a single stored row.
+"""
+import csv
+import io
+from collections import defaultdict
+from datetime import timedelta
+
+import numpy as np
+
+from .gps import find_columns, map_athletes, parse_date
+from .integrations import DailyHRV, ExternalProvider
+from .series import refresh_series
+
+UPSERT_BATCH_SIZE = 1000
+BASELINE_WINDOW_DAYS = 7
+BASELINE_MIN_DAYS = 3  # fewer readings in the window -> no baseline
+
+# Accepted header names per provider (compared lower-cased and stripped).
+# Personal exports carry no athlete column; pass the membership instead.
+PROVIDER_COLUMNS = {
+    ExternalProvider.WHOOP: {
+        "athlete": ("athlete id", "athlete_id", "user id", "user_id"),
+        "date": ("wake onset", "cycle start time", "date"),
+        "rmssd": ("heart rate variability (ms)", "hrv (ms)", "rmssd"),
+    },
+    ExternalProvider.OURA: {
+        "athlete": ("athlete id", "athlete_id", "user id", "user_id"),
+        "date": ("day", "summary_date", "date"),
+        "rmssd": ("average_hrv", "average hrv", "rmssd"),
+    },
+}
+
+
+def read_rmssd(stream, provider, readings=None, stats=None):
+    """
+    Stream one text CSV export into readings[(athlete_id or None, date)] -> [rMSSD ms].
+    """
+    if provider not in PROVIDER_COLUMNS:
+        raise ValueError(f"Unsupported HRV provider: {provider}")
+    readings = defaultdict(list) if readings is None else readings
+    stats = {"rows": 0, "skipped": 0} if stats is None else stats
+
+    reader = csv.reader(stream)
+    cols = find_columns(reader, PROVIDER_COLUMNS[provider], provider, optional=("athlete",))
+    a_idx, d_idx, r_idx = cols["athlete"], cols["date"], cols["rmssd"]
+    width = max(i for i in cols.values() if i is not None)
+    for row in reader:
+        if len(row) <= width:
+            stats["skipped"] += 1
+            continue
+        athlete = row[a_idx].strip() if a_idx is not None else None
+        day = parse_date(row[d_idx])
+        try:
+            rmssd = float(row[r_idx])
+        except ValueError:
+            rmssd = None
+        if day is None or rmssd is None or rmssd <= 0 or athlete == "":
+            stats["skipped"] += 1
+            continue
+        readings[(athlete, day)].append(rmssd)
+        stats["rows"] += 1
+    return readings, stats
+
+
+def rolling_baseline(values, window=BASELINE_WINDOW_DAYS, min_count=BASELINE_MIN_DAYS):
+    """
+    Trailing-window mean, sample SD and CV (%) of a dense daily series with NaN
+    for missing days. Each window ends on its own day; NaN where the window holds
+    fewer than min_count readings.
+    """
+    padded = np.concatenate([np.full(window - 1, np.nan), values])
+    win = np.lib.stride_tricks.sliding_window_view(padded, window)
+    present = ~np.isnan(win)
+    count = present.sum(axis=1)
+    filled = np.where(present, win, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = filled.sum(axis=1) / count
+        dev = np.where(present, win - mean[:, None], 0.0)
+        sd = np.sqrt((dev ** 2).sum(axis=1) / (count - 1))
+        cv = sd / mean * 100
+    enough = count >= min_count
+    return (np.where(enough, mean, np.nan), np.where(enough, sd, np.nan), np.where(enough, cv, np.nan))
+
+
+def _none_if_nan(x):
+    return None if np.isnan(x) else float(x)
+
+
+def refresh_hrv_baselines(source, ranges):
+    """
+    Recompute stored baselines for {membership_id: (first_date, last_date)} of
+    one source. Covers each range plus the following window, since those days'
+    baselines include the changed readings. One SELECT, one bulk update.
+    """
+    if not ranges:
+        return 0
+    span = timedelta(days=BASELINE_WINDOW_DAYS - 1)
+    lo = min(first for first, _ in ranges.values()) - span
+    hi = max(last for _, last in ranges.values()) + span
+
+    by_member = defaultdict(list)
+    for row in (
+        DailyHRV.objects
+        .filter(membership_id__in=list(ranges), source=source, date__range=(lo, hi))
+        .only("id", "membership_id", "date", "ln_rMSSD")
+        .order_by("date")
+    ):
+        by_member[row.membership_id].append(row)
+
+    updated = []
+    for membership_id, rows in by_member.items():
+        first, last = ranges[membership_id]
+        start = first - span
+        values = np.full((last + span - start).days + 1, np.nan)
+        for r in rows:
+            if r.ln_rMSSD is not None and start <= r.date <= last + span:
+                values[(r.date - start).days] = r.ln_rMSSD
+        mean, sd, cv = rolling_baseline(values)
+        for r in rows:
+            if first <= r.date <= last + span:
+                i = (r.date - start).days
+                r.ln_rMSSD_mean_7d = _none_if_nan(mean[i])
+                r.ln_rMSSD_sd_7d = _none_if_nan(sd[i])
+                r.ln_rMSSD_cv_7d = _none_if_nan(cv[i])
+                updated.append(r)
+
+    DailyHRV.objects.bulk_update(
+        updated, ["ln_rMSSD_mean_7d", "ln_rMSSD_sd_7d", "ln_rMSSD_cv_7d"], batch_size=UPSERT_BATCH_SIZE
+    )
+    return len(updated)
+
+
+def import_hrv_exports(provider, files, membership_id=None, team_ids=None):
+    """
+    Import binary file objects of one provider. Rows without an athlete column
+    belong to `membership_id`. Returns a summary dict.
+    """
+    readings, stats = defaultdict(list), {"rows": 0, "skipped": 0}
+    for fh in files:
+        text = io.TextIOWrapper(fh, encoding="utf-8-sig", newline="")
+        try:
+            read_rmssd(text, provider, readings, stats)
+        finally:
+            text.detach()  # leave the caller's file open
+
+    athletes = {a for a, _ in readings if a is not None}
+    membership_by_athlete = map_athletes(provider, athletes, team_ids) if athletes else {}
+    if any(a is None for a, _ in readings):
+        if membership_id is None:
+            raise ValueError("This export has no athlete column; specify the membership.")
+        membership_by_athlete[None] = membership_id
+
+    per_day = defaultdict(list)
+    for (a, d), values in readings.items():
+        if a in membership_by_athlete:
+            per_day[(membership_by_athlete[a], d)].extend(values)
+    keys = list(per_day)
+    rmssd = np.array([np.mean(v) for v in per_day.values()])
+    ln_rmssd = np.log(rmssd) if len(rmssd) else rmssd
+
+    DailyHRV.objects.bulk_create(
+        [
+            DailyHRV(membership_id=m, date=d, source=provider, rMSSD_ms=r, ln_rMSSD=ln)
+            for (m, d), r, ln in zip(keys, rmssd.tolist(), ln_rmssd.tolist())
+        ],
+        batch_size=UPSERT_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=["membership", "date", "source"],
+        update_fields=["rMSSD_ms", "ln_rMSSD", "updated_at"],
+    )
+
+    ranges = {}
+    for m, d in keys:
+        first, last = ranges.get(m, (d, d))
+        ranges[m] = (min(first, d), max(last, d))
+    refresh_hrv_baselines(provider, ranges)
+    # Readings plus the following window, whose baselines include them
+    span = timedelta(days=BASELINE_WINDOW_DAYS - 1)
+    refresh_series("hrv", {m: (first, last + span) for m, (first, last) in ranges.items()})
+
+    return {
+        **stats,
+        "member_days": len(keys),
+        "unmatched_athletes": sorted(athletes - set(membership_by_athlete)),
+    }
@@ -1,4 +1,6 @@
 # performance/integrations.py (models)
+from django.db import models
+
 class ExternalProvider(models.TextChoices):
     WHOOP = "WHOOP", "Whoop"
     OURA = "OURA", "Oura"
@@ -15,12 +17,20 @@ class LinkedDevice(models.Model):
     expires_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=['provider','external_user_id'])]
+
 class DailyHRV(models.Model):
     membership = models.ForeignKey('teams.TeamMembership', on_delete=models.CASCADE, related_name='hrv_daily')
     date = models.DateField()
     rMSSD_ms = models.FloatField(null=True, blank=True)
     ln_rMSSD = models.FloatField(null=True, blank=True)
+    # Rolling 7-day baseline of ln_rMSSD (window ends on `date`), kept by performance.hrv
+    ln_rMSSD_mean_7d = models.FloatField(null=True, blank=True)
+    ln_rMSSD_sd_7d = models.FloatField(null=True, blank=True)
+    ln_rMSSD_cv_7d = models.FloatField(null=True, blank=True)  # % (sd / mean * 100)
     source = models.CharField(max_length=16, choices=ExternalProvider.choices)
+    updated_at = models.DateTimeField(auto_now=True)  # change tracking (risk flags)
 
     class Meta:
         unique_together = [('membership','date','source')]
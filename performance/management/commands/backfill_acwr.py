@@ -0,0 +1,109 @@
+# performance/management/commands/backfill_acwr.py
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Max, Min
+
+from teams.models import TeamMembership
+from performance.acwr import compute_acwr_for_member
+from performance.models import DailyLoad
+
+
+def _init_worker():
+    # Each worker opens its own DB connection; never reuse the parent's socket.
+    import django
+    django.setup()
+    connections.close_all()
+
+
+def _backfill_chunk(chunk):
+    """
+    chunk: list of (membership_id, start_date, end_date). Returns the ids done.
+    """
+    done = []
+    for membership_id, start_date, end_date in chunk:
+        compute_acwr_for_member(membership_id, start_date, end_date)
+        done.append(membership_id)
+    return done
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute INTERNAL LoadACWR for every TeamMembership of a team, a season "
+        "or the whole club, in parallel chunks with a resumable checkpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--team", type=int, help="Team id (default: all teams)")
+        parser.add_argument("--season", type=int, help="Season id (default: all seasons)")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        parser.add_argument("--chunk-size", type=int, default=20, help="Members per task")
+        parser.add_argument("--checkpoint", help="Checkpoint file (default: derived from scope)")
+        parser.add_argument("--reset", action="store_true", help="Ignore an existing checkpoint")
+
+    def handle(self, *args, **opts):
+        if opts["workers"] < 1 or opts["chunk_size"] < 1:
+            raise CommandError("--workers and --chunk-size must be >= 1.")
+
+        scope = {"team": opts["team"], "season": opts["season"]}
+        path = opts["checkpoint"] or "acwr_backfill_team-{team}_season-{season}.json".format(**scope)
+        done = set() if opts["reset"] else self._load_checkpoint(path, scope)
+
+        memberships = TeamMembership.objects.all()
+        if scope["team"]:
+            memberships = memberships.filter(team_id=scope["team"])
+        if scope["season"]:
+            memberships = memberships.filter(season_id=scope["season"])
+
+        # One query for every member's load range; members without loads have nothing to compute.
+        ranges = (
+            DailyLoad.objects
+            .filter(membership__in=memberships)
+            .values("membership_id")
+            .annotate(first=Min("date"), last=Max("date"))
+            .order_by("membership_id")
+        )
+        todo = [(r["membership_id"], r["first"], r["last"]) for r in ranges if r["membership_id"] not in done]
+        if not todo:
+            self.stdout.write(self.style.SUCCESS("Nothing to backfill."))
+            return
+
+        size = opts["chunk_size"]
+        chunks = [todo[i:i + size] for i in range(0, len(todo), size)]
+        self.stdout.write(f"Backfilling {len(todo)} members in {len(chunks)} chunks ({len(done)} already done).")
+
+        if opts["workers"] == 1:
+            for chunk in chunks:
+                done.update(_backfill_chunk(chunk))
+                self._save_checkpoint(path, scope, done)
+        else:
+            # Children must not inherit open connections from this process.
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=opts["workers"], initializer=_init_worker) as pool:
+                futures = [pool.submit(_backfill_chunk, chunk) for chunk in chunks]
+                for future in as_completed(futures):
+                    done.update(future.result())
+                    self._save_checkpoint(path, scope, done)
+                    self.stdout.write(f"  {len(done)} members done")
+
+        os.remove(path)
+        self.stdout.write(self.style.SUCCESS(f"Backfilled ACWR for {len(todo)} members."))
+
+    def _load_checkpoint(self, path, scope):
+        if not os.path.exists(path):
+            return set()
+        with open(path) as fh:
+            data = json.load(fh)
+        if data.get("scope") != scope:
+            raise CommandError(f"Checkpoint {path} belongs to another scope; use --reset or --checkpoint.")
+        return set(data.get("done", []))
+
+    def _save_checkpoint(self, path, scope, done):
+        # Write-then-rename so an interrupted run never leaves a truncated file.
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump({"scope": scope, "done": sorted(done)}, fh)
+        os.replace(tmp, path)
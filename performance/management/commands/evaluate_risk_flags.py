@@ -0,0 +1,25 @@
+# performance/management/commands/evaluate_risk_flags.py
+from django.core.management.base import BaseCommand, CommandError
+
+from performance.risk import purge_expired_flags, run_risk_engine
+
+
+class Command(BaseCommand):
+    help = (
+        "Evaluate the risk rules over LoadACWR / WellnessLog / DailyHRV rows changed "
+        "since the last run and update RiskFlag. Meant to run from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Re-evaluate all data, not just changes")
+        parser.add_argument("--purge-days", type=int, help="Also delete flags expired more than N days ago")
+
+    def handle(self, *args, **opts):
+        if opts["purge_days"] is not None and opts["purge_days"] < 0:
+            raise CommandError("--purge-days must be >= 0.")
+        run = run_risk_engine(full=opts["full"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Evaluated {run.members} members, wrote {run.flags_written} flags."
+        ))
+        if opts["purge_days"] is not None:
+            self.stdout.write(f"Purged {purge_expired_flags(opts['purge_days'])} expired flags.")
@@ -0,0 +1,32 @@
+# performance/management/commands/import_gps.py
+from contextlib import ExitStack
+
+from django.core.management.base import BaseCommand, CommandError
+
+from performance.gps import PROVIDER_COLUMNS, import_gps_exports
+
+
+class Command(BaseCommand):
+    help = "Import Catapult/STATSports session CSV exports into DailyLoad.external_load_pl."
+
+    def add_arguments(self, parser):
+        parser.add_argument("provider", choices=[str(p) for p in PROVIDER_COLUMNS])
+        parser.add_argument("files", nargs="+", help="CSV export files; pass every export of a day together")
+        parser.add_argument("--team", type=int, action="append", help="Only write memberships of this team (repeatable)")
+
+    def handle(self, *args, **opts):
+        with ExitStack() as stack:
+            try:
+                files = [stack.enter_context(open(path, "rb")) for path in opts["files"]]
+                summary = import_gps_exports(opts["provider"], files, team_ids=opts["team"])
+            except (OSError, ValueError) as e:
+                raise CommandError(str(e))
+
+        self.stdout.write(
+            f"{summary['rows']} rows read, {summary['skipped']} skipped, "
+            f"{summary['member_days']} member-days written."
+        )
+        if summary["unmatched_athletes"]:
+            self.stdout.write(self.style.WARNING(
+                "No LinkedDevice for athlete ids: " + ", ".join(summary["unmatched_athletes"])
+            ))
@@ -0,0 +1,32 @@
+# performance/management/commands/import_hrv.py
+from contextlib import ExitStack
+
+from django.core.management.base import BaseCommand, CommandError
+
+from performance.hrv import PROVIDER_COLUMNS, import_hrv_exports
+
+
+class Command(BaseCommand):
+    help = "Import WHOOP/Oura HRV exports into DailyHRV and refresh the 7-day ln_rMSSD baselines."
+
+    def add_arguments(self, parser):
+        parser.add_argument("provider", choices=[str(p) for p in PROVIDER_COLUMNS])
+        parser.add_argument("files", nargs="+", help="CSV export files")
+        parser.add_argument("--membership", type=int, help="TeamMembership id for exports without an athlete column")
+
+    def handle(self, *args, **opts):
+        with ExitStack() as stack:
+            try:
+                files = [stack.enter_context(open(path, "rb")) for path in opts["files"]]
+                summary = import_hrv_exports(opts["provider"], files, membership_id=opts["membership"])
+            except (OSError, ValueError) as e:
+                raise CommandError(str(e))
+
+        self.stdout.write(
+            f"{summary['rows']} rows read, {summary['skipped']} skipped, "
+            f"{summary['member_days']} member-days written."
+        )
+        if summary["unmatched_athletes"]:
+            self.stdout.write(self.style.WARNING(
+                "No LinkedDevice for athlete ids: " + ", ".join(summary["unmatched_athletes"])
+            ))
@@ -0,0 +1,35 @@
+# performance/management/commands/rebuild_load_cube.py
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from performance.cube import refresh_load_cube
+from performance.models import DailyLoad, LoadRollup
+
+
+class Command(BaseCommand):
+    help = "Rebuild the week / month / season load cube (LoadRollup) from DailyLoad."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--team", type=int, help="Team id (default: all teams)")
+
+    def handle(self, *args, **opts):
+        qs = DailyLoad.objects.all()
+        if opts["team"]:
+            qs = qs.filter(membership__team_id=opts["team"])
+
+        by_team = defaultdict(set)
+        for team_id, m, d in qs.values_list("membership__team_id", "membership_id", "date").iterator():
+            by_team[team_id].add((m, d))
+
+        # One team at a time, so its line / team rows are built from complete member rows
+        for team_id, pairs in by_team.items():
+            with transaction.atomic():
+                LoadRollup.objects.filter(team_id=team_id).delete()
+                refresh_load_cube(pairs)
+        if opts["team"] and opts["team"] not in by_team:
+            LoadRollup.objects.filter(team_id=opts["team"]).delete()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt load cube for {len(by_team)} team(s), {sum(map(len, by_team.values()))} member days."
+        ))
@@ -0,0 +1,24 @@
+# performance/management/commands/rollup_weekly_loads.py
+from django.core.management.base import BaseCommand
+
+from performance.models import DailyLoad
+from performance.weekly import refresh_weekly_loads, week_start
+
+
+class Command(BaseCommand):
+    help = "Rebuild WeeklyLoad / TeamWeeklyLoad (Foster load, monotony, strain) from DailyLoad."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--team", type=int, help="Team id (default: all teams)")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Member weeks per batch")
+
+    def handle(self, *args, **opts):
+        qs = DailyLoad.objects.all()
+        if opts["team"]:
+            qs = qs.filter(membership__team_id=opts["team"])
+
+        pairs = sorted({(m, week_start(d)) for m, d in qs.values_list("membership_id", "date").iterator()})
+        size = max(1, opts["chunk_size"])
+        for i in range(0, len(pairs), size):
+            refresh_weekly_loads(pairs[i:i + size])
+        self.stdout.write(self.style.SUCCESS(f"Rolled up {len(pairs)} member weeks."))
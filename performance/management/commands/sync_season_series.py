@@ -0,0 +1,33 @@
+# performance/management/commands/sync_season_series.py
+from django.core.management.base import BaseCommand, CommandError
+
+from teams.models import Season, TeamMembership
+from performance.series import sync_season_series
+
+
+class Command(BaseCommand):
+    help = "Rebuild the packed per-season time series (SeasonSeries) from the row tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--season", type=int, help="Season id (default: all seasons)")
+        parser.add_argument("--team", type=int, help="Team id (default: all teams)")
+        parser.add_argument("--chunk-size", type=int, default=200, help="Members per batch")
+
+    def handle(self, *args, **opts):
+        if opts["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be >= 1.")
+        seasons = Season.objects.all()
+        if opts["season"]:
+            seasons = seasons.filter(pk=opts["season"])
+            if not seasons.exists():
+                raise CommandError(f"Season {opts['season']} does not exist.")
+        memberships = TeamMembership.objects.all()
+        if opts["team"]:
+            memberships = memberships.filter(team_id=opts["team"])
+        ids = list(memberships.order_by("id").values_list("id", flat=True))
+
+        size, written = opts["chunk_size"], 0
+        for season in seasons:
+            for i in range(0, len(ids), size):
+                written += sync_season_series(season, ids[i:i + size])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} season series."))
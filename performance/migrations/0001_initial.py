@@ -0,0 +1,119 @@
+# Generated by Django 5.2.7 on 2026-10-17 11:14
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('teams', '0004_season_teammembership_team_head_coach_must_be_coach_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrainingSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('session_type', models.CharField(choices=[('RECOVERY', 'Recovery'), ('STRENGTH', 'Strength'), ('CONDITIONING', 'Conditioning'), ('TECHNICAL', 'Technical'), ('TACTICAL', 'Tactical'), ('MATCH', 'Match')], default='TECHNICAL', max_length=16)),
+                ('title', models.CharField(max_length=120)),
+                ('start', models.DateTimeField()),
+                ('end', models.DateTimeField()),
+                ('location', models.CharField(blank=True, max_length=255)),
+                ('notes', models.TextField(blank=True)),
+                ('season', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='teams.season')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sessions', to='teams.team')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SessionRPE',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rpe_0_10', models.DecimalField(decimal_places=1, max_digits=4)),
+                ('duration_min', models.PositiveIntegerField()),
+                ('load_au', models.PositiveIntegerField()),
+                ('membership', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='srpe', to='teams.teammembership')),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='srpe', to='performance.trainingsession')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Attendance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('PRESENT', 'Present'), ('ABSENT', 'Absent'), ('EXCUSED', 'Excused'), ('LATE', 'Late')], default='PRESENT', max_length=10)),
+                ('minutes_participated', models.PositiveIntegerField(default=0)),
+                ('membership', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance', to='teams.teammembership')),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance', to='performance.trainingsession')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='WellnessLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(default=django.utils.timezone.now)),
+                ('sleep_quality', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('mood', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('soreness', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('stress', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('notes', models.TextField(blank=True)),
+                ('membership', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='wellness_logs', to='teams.teammembership')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailyLoad',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('internal_load_au', models.PositiveIntegerField(default=0)),
+                ('external_load_pl', models.PositiveIntegerField(default=0)),
+                ('membership', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_loads', to='teams.teammembership')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['membership', 'date'], name='performance_members_0b057f_idx')],
+                'unique_together': {('membership', 'date')},
+            },
+        ),
+        migrations.CreateModel(
+            name='LoadACWR',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('acute_ewma', models.FloatField()),
+                ('chronic_ewma', models.FloatField()),
+                ('ratio', models.FloatField()),
+                ('source', models.CharField(default='INTERNAL', max_length=16)),
+                ('membership', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='acwr', to='teams.teammembership')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['membership', 'date'], name='performance_members_ded96e_idx')],
+                'unique_together': {('membership', 'date', 'source')},
+            },
+        ),
+        migrations.AddIndex(
+            model_name='trainingsession',
+            index=models.Index(fields=['team', 'start'], name='performance_team_id_7e322a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sessionrpe',
+            index=models.Index(fields=['membership', 'session'], name='performance_members_c8124a_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='sessionrpe',
+            unique_together={('session', 'membership')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='attendance',
+            unique_together={('session', 'membership')},
+        ),
+        migrations.AddIndex(
+            model_name='wellnesslog',
+            index=models.Index(fields=['membership', 'date'], name='performance_members_3e995e_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='wellnesslog',
+            unique_together={('membership', 'date')},
+        ),
+    ]
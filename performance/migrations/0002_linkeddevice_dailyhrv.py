@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-17 11:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('performance', '0001_initial'),
+        ('teams', '0004_season_teammembership_team_head_coach_must_be_coach_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyHRV',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('rMSSD_ms', models.FloatField(blank=True, null=True)),
+                ('ln_rMSSD', models.FloatField(blank=True, null=True)),
+                ('source', models.CharField(choices=[('WHOOP', 'Whoop'), ('OURA', 'Oura'), ('CATAPULT', 'Catapult'), ('STATSPORTS', 'STATSports'), ('VEO', 'Veo')], max_length=16)),
+                ('membership', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hrv_daily', to='teams.teammembership')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['membership', 'date'], name='performance_members_fdd38c_idx')],
+                'unique_together': {('membership', 'date', 'source')},
+            },
+        ),
+        migrations.CreateModel(
+            name='LinkedDevice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider', models.CharField(choices=[('WHOOP', 'Whoop'), ('OURA', 'Oura'), ('CATAPULT', 'Catapult'), ('STATSPORTS', 'STATSports'), ('VEO', 'Veo')], max_length=16)),
+                ('external_user_id', models.CharField(max_length=128)),
+                ('access_token', models.CharField(max_length=512)),
+                ('refresh_token', models.CharField(blank=True, max_length=512)),
+                ('expires_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('membership', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='devices', to='teams.teammembership')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['provider', 'external_user_id'], name='performance_provide_f90d0e_idx')],
+            },
+        ),
+    ]
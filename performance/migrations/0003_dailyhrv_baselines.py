@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-17 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('performance', '0002_linkeddevice_dailyhrv'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyhrv',
+            name='ln_rMSSD_cv_7d',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='dailyhrv',
+            name='ln_rMSSD_mean_7d',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='dailyhrv',
+            name='ln_rMSSD_sd_7d',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
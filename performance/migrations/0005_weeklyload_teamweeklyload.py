@@ -0,0 +1,50 @@
+# Generated by Django 5.2.7 on 2026-10-17 11:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('performance', '0004_loadacwr_updated_at'),
+        ('teams', '0004_season_teammembership_team_head_coach_must_be_coach_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamWeeklyLoad',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week_start', models.DateField()),
+                ('line', models.CharField(default='ALL', max_length=3)),
+                ('members', models.PositiveIntegerField(default=0)),
+                ('total_load_au', models.PositiveIntegerField(default=0)),
+                ('mean_load_au', models.FloatField(default=0)),
+                ('mean_monotony', models.FloatField(blank=True, null=True)),
+                ('mean_strain', models.FloatField(blank=True, null=True)),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='weekly_loads', to='teams.team')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['team', 'week_start'], name='performance_team_id_4e90cb_idx')],
+                'unique_together': {('team', 'week_start', 'line')},
+            },
+        ),
+        migrations.CreateModel(
+            name='WeeklyLoad',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week_start', models.DateField()),
+                ('total_load_au', models.PositiveIntegerField(default=0)),
+                ('mean_daily_au', models.FloatField(default=0)),
+                ('sd_daily_au', models.FloatField(default=0)),
+                ('monotony', models.FloatField(blank=True, null=True)),
+                ('strain', models.FloatField(blank=True, null=True)),
+                ('membership', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='weekly_loads', to='teams.teammembership')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['membership', 'week_start'], name='performance_members_d72230_idx')],
+                'unique_together': {('membership', 'week_start')},
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.7 on 2026-10-17 11:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('performance', '0005_weeklyload_teamweeklyload'),
+        ('teams', '0004_season_teammembership_team_head_coach_must_be_coach_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyload',
+            name='duration_min',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='dailyload',
+            name='sessions',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='LoadRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('grain', models.CharField(choices=[('WEEK', 'Week'), ('MONTH', 'Month'), ('SEASON', 'Season')], max_length=6)),
+                ('scope', models.CharField(choices=[('MEMBER', 'Member'), ('LINE', 'Position line'), ('TEAM', 'Team')], max_length=6)),
+                ('period_start', models.DateField()),
+                ('period_end', models.DateField()),
+                ('line', models.CharField(blank=True, max_length=2)),
+                ('members', models.PositiveIntegerField(default=1)),
+                ('internal_load_au', models.BigIntegerField(default=0)),
+                ('external_load_pl', models.BigIntegerField(default=0)),
+                ('sessions', models.PositiveIntegerField(default=0)),
+                ('duration_min', models.PositiveIntegerField(default=0)),
+                ('active_days', models.PositiveIntegerField(default=0)),
+                ('membership', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='load_rollups', to='teams.teammembership')),
+                ('season', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='load_rollups', to='teams.season')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='load_rollups', to='teams.team')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['team', 'grain', 'scope', 'period_start'], name='performance_team_id_92bcea_idx'), models.Index(fields=['membership', 'grain', 'period_start'], name='performance_members_d181e3_idx')],
+            },
+        ),
+    ]
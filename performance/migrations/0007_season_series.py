@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-17 11:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('performance', '0006_load_cube'),
+        ('teams', '0004_season_teammembership_team_head_coach_must_be_coach_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeasonSeries',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(choices=[('internal_load_au', 'Internal load (AU)'), ('external_load_pl', 'External load (PlayerLoad)'), ('acwr_acute', 'ACWR acute EWMA'), ('acwr_chronic', 'ACWR chronic EWMA'), ('acwr_ratio', 'ACWR ratio'), ('ln_rmssd', 'ln rMSSD'), ('ln_rmssd_mean_7d', 'ln rMSSD 7-day mean'), ('ln_rmssd_cv_7d', 'ln rMSSD 7-day CV (%)'), ('sleep_quality', 'Sleep quality'), ('mood', 'Mood'), ('soreness', 'Soreness'), ('stress', 'Stress')], max_length=24)),
+                ('values', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('membership', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='season_series', to='teams.teammembership')),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='member_series', to='teams.season')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['season', 'metric'], name='performance_season__aba026_idx')],
+                'unique_together': {('membership', 'season', 'metric')},
+            },
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.7 on 2026-10-17 11:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('performance', '0007_season_series'),
+        ('teams', '0004_season_teammembership_team_head_coach_must_be_coach_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RiskRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('members', models.PositiveIntegerField(default=0)),
+                ('flags_written', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'get_latest_by': 'started_at',
+            },
+        ),
+        migrations.AddField(
+            model_name='dailyhrv',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='wellnesslog',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.CreateModel(
+            name='RiskFlag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rule', models.CharField(max_length=32)),
+                ('severity', models.CharField(choices=[('LOW', 'Low'), ('MEDIUM', 'Medium'), ('HIGH', 'High')], max_length=6)),
+                ('first_date', models.DateField()),
+                ('last_date', models.DateField()),
+                ('expires_on', models.DateField()),
+                ('value', models.FloatField()),
+                ('threshold', models.FloatField()),
+                ('message', models.CharField(max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('membership', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='risk_flags', to='teams.teammembership')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='risk_flags', to='teams.team')),
+            ],
+            options={
+                'ordering': ['-last_date'],
+                'indexes': [models.Index(fields=['team', 'expires_on'], name='performance_team_id_551323_idx'), models.Index(fields=['membership', 'rule', 'expires_on'], name='performance_members_97587d_idx')],
+            },
+        ),
+    ]
@@ -47,6 +47,7 @@ class WellnessLog(models.Model):
     soreness = models.PositiveSmallIntegerField(null=True, blank=True)       # 1..5
     stress = models.PositiveSmallIntegerField(null=True, blank=True)         # optional 1..5
     notes = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)  # change tracking (risk flags)
 
     class Meta:
         unique_together = [('membership','date')]
@@ -74,6 +75,8 @@ class DailyLoad(models.Model):
     date = models.DateField()
     internal_load_au = models.PositiveIntegerField(default=0)  # sum of SessionRPE per day
     external_load_pl = models.PositiveIntegerField(default=0)  # optional: sum of GPS PlayerLoad, etc.
+    sessions = models.PositiveIntegerField(default=0)          # SessionRPE rows that day
+    duration_min = models.PositiveIntegerField(default=0)      # sum of SessionRPE.duration_min
 
     class Meta:
         unique_together = [('membership','date')]
@@ -89,7 +92,155 @@ class LoadACWR(models.Model):
     chronic_ewma = models.FloatField()
     ratio = models.FloatField()
     source = models.CharField(max_length=16, default="INTERNAL")  # INTERNAL / EXTERNAL
+    updated_at = models.DateTimeField(auto_now=True)  # conditional GET / change tracking
 
     class Meta:
         unique_together = [('membership','date','source')]
         indexes = [models.Index(fields=['membership','date'])]
+
+class WeeklyLoad(models.Model):
+    """
+    Foster weekly roll-up per athlete (Monday-based week, missing days = 0).
+    monotony = mean daily load / SD daily load; strain = weekly load x monotony.
+    """
+    membership = models.ForeignKey('teams.TeamMembership', on_delete=models.CASCADE, related_name='weekly_loads')
+    week_start = models.DateField()  # Monday
+    total_load_au = models.PositiveIntegerField(default=0)
+    mean_daily_au = models.FloatField(default=0)
+    sd_daily_au = models.FloatField(default=0)
+    monotony = models.FloatField(null=True, blank=True)  # null when SD is 0
+    strain = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        unique_together = [('membership','week_start')]
+        indexes = [models.Index(fields=['membership','week_start'])]
+
+class TeamWeeklyLoad(models.Model):
+    """
+    Squad (line='ALL') and position-line (GK/DF/MF/FW) aggregates of WeeklyLoad
+    over PLAYER memberships, via TeamMembership.primary_position.line.
+    """
+    ALL = "ALL"
+
+    team = models.ForeignKey('teams.Team', on_delete=models.CASCADE, related_name='weekly_loads')
+    week_start = models.DateField()
+    line = models.CharField(max_length=3, default=ALL)
+    members = models.PositiveIntegerField(default=0)
+    total_load_au = models.PositiveIntegerField(default=0)    # sum over members
+    mean_load_au = models.FloatField(default=0)               # per-member average weekly load
+    mean_monotony = models.FloatField(null=True, blank=True)
+    mean_strain = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        unique_together = [('team','week_start','line')]
+        indexes = [models.Index(fields=['team','week_start'])]
+
+class LoadRollup(models.Model):
+    """
+    Load cube: additive DailyLoad / SessionRPE totals per grain (week, month,
+    season) and scope (member, position line, team).
+    MEMBER weeks and months are summed from DailyLoad; MEMBER seasons from the
+    months fully inside the season plus the edge days. LINE / TEAM rows sum the
+    MEMBER rows of the same period (PLAYER memberships).
+    """
+    WEEK = "WEEK"; MONTH = "MONTH"; SEASON = "SEASON"
+    GRAIN_CHOICES = ((WEEK, "Week"), (MONTH, "Month"), (SEASON, "Season"))
+    MEMBER = "MEMBER"; LINE = "LINE"; TEAM = "TEAM"
+    SCOPE_CHOICES = ((MEMBER, "Member"), (LINE, "Position line"), (TEAM, "Team"))
+
+    grain = models.CharField(max_length=6, choices=GRAIN_CHOICES)
+    scope = models.CharField(max_length=6, choices=SCOPE_CHOICES)
+    period_start = models.DateField()
+    period_end = models.DateField()
+    season = models.ForeignKey('teams.Season', on_delete=models.CASCADE, null=True, blank=True, related_name='load_rollups')
+    team = models.ForeignKey('teams.Team', on_delete=models.CASCADE, related_name='load_rollups')
+    membership = models.ForeignKey('teams.TeamMembership', on_delete=models.CASCADE, null=True, blank=True, related_name='load_rollups')
+    line = models.CharField(max_length=2, blank=True)  # LINE scope only
+    members = models.PositiveIntegerField(default=1)
+    internal_load_au = models.BigIntegerField(default=0)
+    external_load_pl = models.BigIntegerField(default=0)
+    sessions = models.PositiveIntegerField(default=0)
+    duration_min = models.PositiveIntegerField(default=0)
+    active_days = models.PositiveIntegerField(default=0)  # days with internal load > 0
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['team','grain','scope','period_start']),
+            models.Index(fields=['membership','grain','period_start']),
+        ]
+
+class SeriesMetric(models.TextChoices):
+    INTERNAL_LOAD = "internal_load_au", "Internal load (AU)"
+    EXTERNAL_LOAD = "external_load_pl", "External load (PlayerLoad)"
+    ACWR_ACUTE = "acwr_acute", "ACWR acute EWMA"
+    ACWR_CHRONIC = "acwr_chronic", "ACWR chronic EWMA"
+    ACWR_RATIO = "acwr_ratio", "ACWR ratio"
+    LN_RMSSD = "ln_rmssd", "ln rMSSD"
+    LN_RMSSD_MEAN_7D = "ln_rmssd_mean_7d", "ln rMSSD 7-day mean"
+    LN_RMSSD_CV_7D = "ln_rmssd_cv_7d", "ln rMSSD 7-day CV (%)"
+    SLEEP_QUALITY = "sleep_quality", "Sleep quality"
+    MOOD = "mood", "Mood"
+    SORENESS = "soreness", "Soreness"
+    STRESS = "stress", "Stress"
+
+class SeasonSeries(models.Model):
+    """
+    One metric of one member over one season as a packed little-endian float32
+    array, indexed by day offset from Season.start_date (NaN = no value).
+    A read-side copy of DailyLoad / LoadACWR / DailyHRV / WellnessLog, kept in
+    sync by performance.series; the row tables stay the source of truth.
+    """
+    membership = models.ForeignKey('teams.TeamMembership', on_delete=models.CASCADE, related_name='season_series')
+    season = models.ForeignKey('teams.Season', on_delete=models.CASCADE, related_name='member_series')
+    metric = models.CharField(max_length=24, choices=SeriesMetric.choices)
+    values = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [('membership','season','metric')]
+        indexes = [models.Index(fields=['season','metric'])]
+
+class RiskFlag(models.Model):
+    """
+    A risk rule (performance.risk.RULES) firing for a member. Consecutive hits of
+    the same rule extend one flag (last_date / expires_on) instead of stacking
+    duplicates; a flag is active while expires_on >= today.
+    """
+    LOW = "LOW"; MEDIUM = "MEDIUM"; HIGH = "HIGH"
+    SEVERITY_CHOICES = ((LOW,"Low"), (MEDIUM,"Medium"), (HIGH,"High"))
+
+    team = models.ForeignKey('teams.Team', on_delete=models.CASCADE, related_name='risk_flags')
+    membership = models.ForeignKey('teams.TeamMembership', on_delete=models.CASCADE, related_name='risk_flags')
+    rule = models.CharField(max_length=32)
+    severity = models.CharField(max_length=6, choices=SEVERITY_CHOICES)
+    first_date = models.DateField()
+    last_date = models.DateField()          # latest day the rule fired
+    expires_on = models.DateField()         # last_date + rule TTL
+    value = models.FloatField()             # observed value on last_date
+    threshold = models.FloatField()         # limit it was compared with
+    message = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['team','expires_on']),
+            models.Index(fields=['membership','rule','expires_on']),
+        ]
+        ordering = ['-last_date']
+
+class RiskRun(models.Model):
+    """
+    One risk-flag evaluation pass; the next pass only looks at rows changed
+    since the latest run's started_at.
+    """
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(null=True, blank=True)
+    members = models.PositiveIntegerField(default=0)
+    flags_written = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        get_latest_by = 'started_at'
+
+# External-provider models live in integrations.py; import them so Django registers them.
+from .integrations import ExternalProvider, LinkedDevice, DailyHRV  # noqa: E402
@@ -0,0 +1,96 @@
+# performance/projection.py
+"""
+What-if ACWR projection from planned calendar sessions. Nothing is persisted.
+
+Each squad member starts from the latest INTERNAL LoadACWR state before the
+projection window (decayed over any days after it). Planned TRAINING / MATCH
+events add estimated RPE x duration to every player not marked absent, injured
+or excused for them; days that already have a DailyLoad use the recorded load.
+The squad is then rolled forward with one matrix product per EWMA.
+"""
+from datetime import timedelta
+
+import numpy as np
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from calendar_events.models import Attendance, Event
+from .acwr import ACUTE_HALFLIFE_DAYS, CHRONIC_HALFLIFE_DAYS, alpha_from_halflife, project_acwr
+from .models import DailyLoad, LoadACWR
+
+DEFAULT_RPE = {'TRAINING': 6.0, 'MATCH': 8.0}
+PLANNED_TYPES = tuple(DEFAULT_RPE)
+EXCLUDED_STATUSES = ('ABSENT', 'INJURED', 'EXCUSED')
+
+
+def planned_sessions(team_id, start, end, default_rpe=None, overrides=None):
+    """
+    The team's TRAINING / MATCH events starting in [start, end] with their
+    estimated load. overrides: {event_id: {"rpe": .., "duration_min": ..}};
+    duration defaults to the event length, RPE to default_rpe / DEFAULT_RPE.
+    """
+    rpe_for = {**DEFAULT_RPE, **(default_rpe or {})}
+    overrides = overrides or {}
+    sessions = []
+    for e in Event.objects.filter(
+        team_id=team_id, event_type__in=PLANNED_TYPES, start_time__date__range=(start, end),
+    ).values('id', 'title', 'event_type', 'start_time', 'end_time'):
+        override = overrides.get(e['id'], {})
+        duration = override.get('duration_min')
+        if duration is None:
+            duration = max(0, round((e['end_time'] - e['start_time']).total_seconds() / 60))
+        rpe = float(override.get('rpe', rpe_for[e['event_type']]))
+        sessions.append({
+            'event': e['id'],
+            'title': e['title'],
+            'event_type': e['event_type'],
+            'date': timezone.localdate(e['start_time']),
+            'rpe': rpe,
+            'duration_min': duration,
+            'load_au': round(rpe * duration),
+        })
+    return sessions
+
+
+def project_team_acwr(team, start, days, default_rpe=None, overrides=None):
+    """
+    Returns (members, sessions, loads, acute, chronic, ratio); the arrays are
+    (members, days) over [start, start + days).
+    """
+    end = start + timedelta(days=days - 1)
+    latest = LoadACWR.objects.filter(
+        membership=OuterRef('pk'), source='INTERNAL', date__lt=start,
+    ).order_by('-date')
+    members = list(
+        team.get_squad().order_by('id').annotate(
+            state_date=Subquery(latest.values('date')[:1]),
+            acute0=Subquery(latest.values('acute_ewma')[:1]),
+            chronic0=Subquery(latest.values('chronic_ewma')[:1]),
+        )
+    )
+    row_of = {m.id: i for i, m in enumerate(members)}
+    sessions = planned_sessions(team.id, start, end, default_rpe, overrides)
+
+    X = np.zeros((len(members), days))
+    excluded = set(
+        Attendance.objects.filter(event_id__in=[s['event'] for s in sessions], status__in=EXCLUDED_STATUSES)
+        .values_list('event_id', 'player_id')
+    )
+    users = np.array([m.user_id for m in members])
+    for s in sessions:
+        skip = {player for event, player in excluded if event == s['event']}
+        X[:, (s['date'] - start).days] += s['load_au'] * ~np.isin(users, list(skip))
+
+    # Recorded days replace the plan
+    for m, d, load in DailyLoad.objects.filter(
+        membership_id__in=row_of, date__range=(start, end),
+    ).values_list('membership_id', 'date', 'internal_load_au'):
+        X[row_of[m], (d - start).days] = load
+
+    # Latest state, decayed over the load-free days between it and `start`
+    gap = np.array([(start - m.state_date).days - 1 if m.state_date else 0 for m in members])
+    acute0 = np.array([m.acute0 or 0.0 for m in members]) * (1 - alpha_from_halflife(ACUTE_HALFLIFE_DAYS)) ** gap
+    chronic0 = np.array([m.chronic0 or 0.0 for m in members]) * (1 - alpha_from_halflife(CHRONIC_HALFLIFE_DAYS)) ** gap
+
+    acute, chronic, ratio = project_acwr(X, acute0, chronic0)
+    return members, sessions, X, acute, chronic, ratio
@@ -0,0 +1,227 @@
+# performance/risk.py
+"""
+Batch risk-flag engine.
+
+Rules are declarative (RULES). A run picks up only the members whose LoadACWR,
+WellnessLog or DailyHRV rows changed since the previous RiskRun, loads one
+(columns x members x days) matrix per source and evaluates every rule of that
+source as a NumPy expression over the whole matrix. Hits are merged into
+RiskFlag: a rule firing again before its flag expires extends that flag, so
+re-running over the same data never stacks duplicates.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Avg, Min
+from django.utils import timezone
+
+from teams.models import TeamMembership
+from .columnar import dense_matrix
+from .integrations import DailyHRV
+from .models import LoadACWR, RiskFlag, RiskRun, WellnessLog
+
+UPSERT_BATCH_SIZE = 1000
+
+# source -> (model, filters, columns loaded into the matrix). Several rows per
+# member-day (DailyHRV from two providers) are averaged.
+SOURCES = {
+    'acwr': (LoadACWR, {'source': 'INTERNAL'}, ('ratio',)),
+    'wellness': (WellnessLog, {}, ('soreness',)),
+    'hrv': (DailyHRV, {}, ('ln_rMSSD', 'ln_rMSSD_mean_7d', 'ln_rMSSD_sd_7d')),
+}
+
+# kind:
+#   above / below: `column` vs the fixed `threshold`
+#   spike:         `column` >= mean of the previous `window` days + `threshold`
+#   below_band:    `column` < `mean` - `threshold` x `sd` (stored baseline columns)
+# warmup_days (optional): ignore the first N days of a member's series, e.g. while
+# the chronic EWMA still starts from 0.
+RULES = {
+    'acwr_high': dict(
+        source='acwr', kind='above', column='ratio', threshold=1.5, warmup_days=28,
+        severity=RiskFlag.HIGH, ttl_days=7, message='ACWR ratio above {threshold:g}',
+    ),
+    'soreness_spike': dict(
+        source='wellness', kind='spike', column='soreness', window=7, threshold=2,
+        severity=RiskFlag.MEDIUM, ttl_days=3, message='Soreness {threshold:g}+ points above its 7-day mean',
+    ),
+    'hrv_suppressed': dict(
+        source='hrv', kind='below_band', column='ln_rMSSD', mean='ln_rMSSD_mean_7d', sd='ln_rMSSD_sd_7d',
+        threshold=1, severity=RiskFlag.MEDIUM, ttl_days=3,
+        message='ln rMSSD below its 7-day baseline minus {threshold:g} SD',
+    ),
+}
+
+
+def trailing_mean(x, window):
+    """
+    Mean of the previous `window` days for every day of a (members, days)
+    matrix, ignoring NaN; NaN where none of those days has a value.
+    """
+    padded = np.concatenate([np.full((x.shape[0], window), np.nan), x], axis=1)
+    win = np.lib.stride_tricks.sliding_window_view(padded, window, axis=1)[:, :x.shape[1]]
+    present = ~np.isnan(win)
+    count = present.sum(axis=-1)
+    total = np.where(present, win, 0.0).sum(axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return total / count
+
+
+def evaluate_rule(rule, X, columns):
+    """
+    X: (columns, members, days) matrix of the rule's source.
+    Returns (hit, value, limit), each (members, days).
+    """
+    x = X[columns.index(rule['column'])]
+    kind = rule['kind']
+    if kind in ('above', 'below'):
+        limit = np.full_like(x, rule['threshold'])
+    elif kind == 'spike':
+        limit = trailing_mean(x, rule['window']) + rule['threshold']
+    elif kind == 'below_band':
+        limit = X[columns.index(rule['mean'])] - rule['threshold'] * X[columns.index(rule['sd'])]
+    else:
+        raise ValueError(f"Unknown rule kind: {kind}")
+    with np.errstate(invalid='ignore'):  # NaN compares False: no data, no flag
+        hit = x > limit if kind == 'above' else (x >= limit if kind == 'spike' else x < limit)
+    return hit, x, limit
+
+
+def changed_since(model, filters, since):
+    """
+    {membership_id: earliest changed date} for rows updated at or after `since`
+    (every row when since is None).
+    """
+    qs = model.objects.filter(**filters)
+    if since is not None:
+        qs = qs.filter(updated_at__gte=since)
+    return dict(qs.values('membership_id').annotate(d=Min('date')).values_list('membership_id', 'd'))
+
+
+def evaluate_source(source, starts):
+    """
+    Hits (membership_id, rule, date, value, limit) of every rule on `source`
+    for days on or after each member's changed date.
+    """
+    rules = {key: rule for key, rule in RULES.items() if rule['source'] == source}
+    if not rules or not starts:
+        return []
+    model, filters, columns = SOURCES[source]
+    lookback = max(rule.get('window', 0) for rule in rules.values())
+    lo = min(starts.values()) - timedelta(days=lookback)
+    rows = list(
+        model.objects
+        .filter(membership_id__in=starts, date__gte=lo, **filters)
+        .values('membership_id', 'date')
+        .annotate(**{c: Avg(c) for c in columns})
+        .values_list('membership_id', 'date', *columns)
+    )
+    if not rows:
+        return []
+    ids = sorted(starts)
+    n_days = (max(r[1] for r in rows) - lo).days + 1
+    X = dense_matrix(rows, ids, lo, n_days, len(columns))
+
+    # Days before a member's change were evaluated by an earlier run
+    days = np.arange(n_days)[None, :]
+    fresh = days >= np.array([(starts[m] - lo).days for m in ids])[:, None]
+    if any(rule.get('warmup_days') for rule in rules.values()):
+        series_start = dict(
+            model.objects.filter(membership_id__in=ids, **filters)
+            .values('membership_id').annotate(d=Min('date')).values_list('membership_id', 'd')
+        )
+        since_start = days - np.array([(series_start[m] - lo).days for m in ids])[:, None]
+    hits = []
+    for key, rule in rules.items():
+        hit, value, limit = evaluate_rule(rule, X, columns)
+        hit &= fresh
+        if rule.get('warmup_days'):
+            hit &= since_start >= rule['warmup_days']
+        for i, j in zip(*np.nonzero(hit)):
+            hits.append((ids[i], key, lo + timedelta(days=int(j)), float(value[i, j]), float(limit[i, j])))
+    return hits
+
+
+def merge_flags(hits, now=None):
+    """
+    Fold hits into RiskFlag. A hit on or before the expiry of the latest flag
+    of the same (member, rule) extends it; otherwise a new flag opens.
+    Returns the number of flags created or updated.
+    """
+    now = now or timezone.now()
+    by_key = defaultdict(list)
+    for m, key, day, value, limit in hits:
+        by_key[(m, key)].append((day, value, limit))
+    if not by_key:
+        return 0
+    ids = {m for m, _ in by_key}
+    team_of = dict(TeamMembership.objects.filter(id__in=ids).values_list('id', 'team_id'))
+    lo = min(day for values in by_key.values() for day, _, _ in values)
+
+    current = {}
+    for flag in RiskFlag.objects.filter(
+        membership_id__in=ids, rule__in={k for _, k in by_key}, expires_on__gte=lo,
+    ).order_by('last_date'):
+        current[(flag.membership_id, flag.rule)] = flag  # latest wins
+
+    created, updated = [], {}
+    for (m, key), values in by_key.items():
+        rule = RULES[key]
+        ttl = timedelta(days=rule['ttl_days'])
+        flag = current.get((m, key))
+        for day, value, limit in sorted(values):
+            if flag is not None and flag.first_date - ttl <= day <= flag.expires_on:
+                flag.first_date = min(flag.first_date, day)
+                if day >= flag.last_date:
+                    flag.last_date, flag.value, flag.threshold = day, value, limit
+                flag.expires_on = flag.last_date + ttl
+                flag.updated_at = now
+                if flag.pk:
+                    updated[flag.pk] = flag
+                continue
+            flag = RiskFlag(
+                team_id=team_of[m], membership_id=m, rule=key, severity=rule['severity'],
+                first_date=day, last_date=day, expires_on=day + ttl, value=value, threshold=limit,
+                message=rule['message'].format(**rule),
+            )
+            created.append(flag)
+
+    RiskFlag.objects.bulk_create(created, batch_size=UPSERT_BATCH_SIZE)
+    RiskFlag.objects.bulk_update(
+        updated.values(), ['first_date', 'last_date', 'expires_on', 'value', 'threshold', 'updated_at'],
+        batch_size=UPSERT_BATCH_SIZE,
+    )
+    return len(created) + len(updated)
+
+
+def run_risk_engine(full=False):
+    """
+    One batch pass over the data changed since the last finished run (or all
+    data with full=True). Returns the RiskRun.
+    """
+    last = None if full else RiskRun.objects.filter(finished_at__isnull=False).order_by('-started_at').first()
+    since = last.started_at if last else None
+    run = RiskRun.objects.create(started_at=timezone.now())
+
+    with transaction.atomic():
+        hits, members = [], set()
+        for source, (model, filters, _) in SOURCES.items():
+            starts = changed_since(model, filters, since)
+            members |= set(starts)
+            hits += evaluate_source(source, starts)
+        run.flags_written = merge_flags(hits)
+
+    run.members = len(members)
+    run.finished_at = timezone.now()
+    run.save(update_fields=['members', 'flags_written', 'finished_at'])
+    return run
+
+
+def purge_expired_flags(older_than_days):
+    """
+    Delete flags that expired more than `older_than_days` ago.
+    """
+    cutoff = timezone.localdate() - timedelta(days=older_than_days)
+    return RiskFlag.objects.filter(expires_on__lt=cutoff).delete()[0]
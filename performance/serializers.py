@@ -0,0 +1,79 @@
+from rest_framework import serializers
+
+from teams.models import TeamMembership
+from .models import RiskFlag
+from .projection import PLANNED_TYPES
+
+
+class SessionRPEEntrySerializer(serializers.Serializer):
+    membership = serializers.IntegerField()
+    rpe_0_10 = serializers.DecimalField(max_digits=4, decimal_places=1, min_value=0, max_value=10)
+    duration_min = serializers.IntegerField(min_value=0)
+
+
+class SessionRPEBulkSerializer(serializers.Serializer):
+    """
+    Payload: {"entries": [{"membership": <id>, "rpe_0_10": 7.5, "duration_min": 90}, ...]}
+    Expects context={"session": TrainingSession}.
+    """
+    entries = SessionRPEEntrySerializer(many=True, allow_empty=False)
+
+    def validate_entries(self, entries):
+        ids = [e["membership"] for e in entries]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError("Each membership may appear only once.")
+
+        session = self.context["session"]
+        valid = set(
+            TeamMembership.objects.filter(team_id=session.team_id, id__in=ids).values_list("id", flat=True)
+        )
+        unknown = sorted(set(ids) - valid)
+        if unknown:
+            raise serializers.ValidationError(f"Memberships not on this session's team: {unknown}")
+        return entries
+
+
+class RiskFlagSerializer(serializers.ModelSerializer):
+    player_name = serializers.CharField(source='membership.user.get_full_name', read_only=True)
+
+    class Meta:
+        model = RiskFlag
+        fields = [
+            'id', 'membership', 'player_name', 'rule', 'severity', 'message',
+            'first_date', 'last_date', 'expires_on', 'value', 'threshold',
+        ]
+        read_only_fields = fields
+
+
+class PlannedSessionOverrideSerializer(serializers.Serializer):
+    event = serializers.IntegerField()
+    rpe = serializers.DecimalField(max_digits=4, decimal_places=1, min_value=0, max_value=10, required=False)
+    duration_min = serializers.IntegerField(min_value=0, required=False)
+
+
+class ACWRProjectionSerializer(serializers.Serializer):
+    """
+    Payload (all optional):
+    {"start": "YYYY-MM-DD", "days": 14, "default_rpe": {"TRAINING": 6, "MATCH": 8},
+     "sessions": [{"event": <id>, "rpe": 7.5, "duration_min": 75}, ...]}
+    """
+    MAX_DAYS = 56
+
+    start = serializers.DateField(required=False)
+    days = serializers.IntegerField(min_value=1, max_value=MAX_DAYS, default=14)
+    default_rpe = serializers.DictField(
+        child=serializers.DecimalField(max_digits=4, decimal_places=1, min_value=0, max_value=10), required=False,
+    )
+    sessions = PlannedSessionOverrideSerializer(many=True, required=False)
+
+    def validate_default_rpe(self, value):
+        unknown = sorted(set(value) - set(PLANNED_TYPES))
+        if unknown:
+            raise serializers.ValidationError(f"Only {', '.join(PLANNED_TYPES)} can be given, not {unknown}.")
+        return {k: float(v) for k, v in value.items()}
+
+    def validate_sessions(self, value):
+        ids = [s["event"] for s in value]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError("Each event may appear only once.")
+        return value
@@ -0,0 +1,217 @@
+# performance/series.py
+"""
+Compact per-season time series (SeasonSeries): one packed float32 array per
+(membership, season, metric), indexed by day offset from Season.start_date.
+
+Readers return NumPy arrays straight from the blobs, so a season view costs one
+query and no per-day model instances. Writers patch individual days in place
+(read, modify, write back the blob); refresh_series re-syncs date ranges from
+the row tables, which stay the source of truth.
+
+Arrays are sized to the season when written; editing a season's dates calls
+for a full `sync_season_series`.
+"""
+from datetime import date
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Avg
+
+from teams.models import Season
+from .integrations import DailyHRV
+from .models import DailyLoad, LoadACWR, SeasonSeries, SeriesMetric, WellnessLog
+
+UPSERT_BATCH_SIZE = 500
+DTYPE = np.dtype('<f4')
+
+# Row table -> (model, filters, {metric: column}). Several rows per member-day
+# (e.g. DailyHRV from two providers) are averaged.
+SOURCES = {
+    'load': (DailyLoad, {}, {
+        SeriesMetric.INTERNAL_LOAD: 'internal_load_au',
+        SeriesMetric.EXTERNAL_LOAD: 'external_load_pl',
+    }),
+    'acwr': (LoadACWR, {'source': 'INTERNAL'}, {
+        SeriesMetric.ACWR_ACUTE: 'acute_ewma',
+        SeriesMetric.ACWR_CHRONIC: 'chronic_ewma',
+        SeriesMetric.ACWR_RATIO: 'ratio',
+    }),
+    'hrv': (DailyHRV, {}, {
+        SeriesMetric.LN_RMSSD: 'ln_rMSSD',
+        SeriesMetric.LN_RMSSD_MEAN_7D: 'ln_rMSSD_mean_7d',
+        SeriesMetric.LN_RMSSD_CV_7D: 'ln_rMSSD_cv_7d',
+    }),
+    'wellness': (WellnessLog, {}, {
+        SeriesMetric.SLEEP_QUALITY: 'sleep_quality',
+        SeriesMetric.MOOD: 'mood',
+        SeriesMetric.SORENESS: 'soreness',
+        SeriesMetric.STRESS: 'stress',
+    }),
+}
+
+
+def season_days(season):
+    return (season.end_date - season.start_date).days + 1
+
+
+def pack(values):
+    return np.asarray(values, dtype=DTYPE).tobytes()
+
+
+def unpack(blob, n_days):
+    """
+    Float array of exactly n_days (NaN-padded or truncated); always a writable copy.
+    """
+    arr = np.frombuffer(bytes(blob), dtype=DTYPE)[:n_days]
+    out = np.full(n_days, np.nan, dtype=DTYPE)
+    out[:len(arr)] = arr
+    return out
+
+
+def add_range(ranges, membership_id, first, last=None):
+    """
+    Widen ranges[membership_id] = (first, last) in place; last=None = open-ended.
+    """
+    if membership_id in ranges:
+        lo, hi = ranges[membership_id]
+        first = min(first, lo)
+        last = None if last is None or hi is None else max(last, hi)
+    ranges[membership_id] = (first, last)
+
+
+# ---- readers ---------------------------------------------------------------
+
+def read_series(membership_id, season, metric, start=None, end=None):
+    """
+    One member's metric over the season (or [start, end] inside it), NaN where missing.
+    """
+    return read_matrix([membership_id], season, [metric], start, end)[0, 0]
+
+
+def read_matrix(membership_ids, season, metrics, start=None, end=None):
+    """
+    (metrics, members, days) float array for [start, end] (default: whole
+    season) in one query; members / metrics without a stored series are NaN.
+    """
+    start = max(start or season.start_date, season.start_date)
+    end = min(end or season.end_date, season.end_date)
+    n = season_days(season)
+    lo, hi = (start - season.start_date).days, (end - season.start_date).days + 1
+    out = np.full((len(metrics), len(membership_ids), max(hi - lo, 0)), np.nan, dtype=DTYPE)
+    if hi <= lo:
+        return out
+    row_of = {m: i for i, m in enumerate(membership_ids)}
+    metric_of = {k: i for i, k in enumerate(metrics)}
+    for m, metric, blob in SeasonSeries.objects.filter(
+        membership_id__in=membership_ids, season=season, metric__in=metrics,
+    ).values_list('membership_id', 'metric', 'values'):
+        out[metric_of[metric], row_of[m]] = unpack(blob, n)[lo:hi]
+    return out
+
+
+# ---- writers ---------------------------------------------------------------
+
+def _write(season, arrays, existing):
+    """
+    Upsert {(membership_id, metric): array}; all-NaN arrays are only written
+    when a stored series has to be cleared.
+    """
+    rows = [
+        SeasonSeries(membership_id=m, season=season, metric=metric, values=pack(arr))
+        for (m, metric), arr in arrays.items()
+        if (m, metric) in existing or not np.isnan(arr).all()
+    ]
+    SeasonSeries.objects.bulk_create(
+        rows,
+        batch_size=UPSERT_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['membership', 'season', 'metric'],
+        update_fields=['values', 'updated_at'],
+    )
+    return len(rows)
+
+
+def _load(season, membership_ids, metrics):
+    n = season_days(season)
+    return {
+        (m, metric): unpack(blob, n)
+        for m, metric, blob in SeasonSeries.objects.select_for_update().filter(
+            membership_id__in=membership_ids, season=season, metric__in=metrics,
+        ).values_list('membership_id', 'metric', 'values')
+    }
+
+
+def patch_days(season, metric, values):
+    """
+    Set single days of one metric: values = {(membership_id, date): float | None}.
+    Dates outside the season are ignored.
+    """
+    values = {(m, d): v for (m, d), v in values.items() if season.start_date <= d <= season.end_date}
+    if not values:
+        return 0
+    n = season_days(season)
+    with transaction.atomic():
+        existing = _load(season, {m for m, _ in values}, [metric])
+        arrays = {}
+        for (m, d), v in values.items():
+            arr = arrays.setdefault((m, metric), existing.get((m, metric), np.full(n, np.nan, dtype=DTYPE)))
+            arr[(d - season.start_date).days] = np.nan if v is None else v
+        return _write(season, arrays, existing)
+
+
+def refresh_series(source, ranges):
+    """
+    Re-sync one row table's metrics from {membership_id: (first, last)} date
+    ranges (last=None: to the end of each season). Days in range without a row
+    are cleared, so deletions propagate. Returns the number of series written.
+    """
+    if not ranges:
+        return 0
+    model, filters, fields = SOURCES[source]
+    lo = min(first for first, _ in ranges.values())
+    hi = max((last or date.max) for _, last in ranges.values())
+    written = 0
+    for season in Season.objects.filter(start_date__lte=hi, end_date__gte=lo):
+        # Clip each member's range to the season
+        spans = {}
+        for m, (first, last) in ranges.items():
+            first, last = max(first, season.start_date), min(last or season.end_date, season.end_date)
+            if first <= last:
+                spans[m] = ((first - season.start_date).days, (last - season.start_date).days + 1)
+        if not spans:
+            continue
+        n = season_days(season)
+        rows = (
+            model.objects
+            .filter(membership_id__in=spans, date__range=(max(lo, season.start_date), min(hi, season.end_date)),
+                    **filters)
+            .values('membership_id', 'date')
+            .annotate(**{metric: Avg(column) for metric, column in fields.items()})
+        )
+        with transaction.atomic():
+            existing = _load(season, spans, list(fields))
+            arrays = {}
+            for m, (i, j) in spans.items():
+                for metric in fields:
+                    arr = existing.get((m, metric))
+                    arr = np.full(n, np.nan, dtype=DTYPE) if arr is None else arr
+                    arr[i:j] = np.nan
+                    arrays[(m, metric)] = arr
+            for r in rows:
+                i, j = spans[r['membership_id']]
+                k = (r['date'] - season.start_date).days
+                if i <= k < j:
+                    for metric in fields:
+                        if r[metric] is not None:
+                            arrays[(r['membership_id'], metric)][k] = r[metric]
+            written += _write(season, arrays, existing)
+    return written
+
+
+def sync_season_series(season, membership_ids):
+    """
+    Rebuild every metric of the given members over the whole season.
+    """
+    ranges = {m: (season.start_date, season.end_date) for m in membership_ids}
+    return sum(refresh_series(source, ranges) for source in SOURCES)
+
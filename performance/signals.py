@@ -1,20 +1,195 @@
 # performance/signals.py
+import threading
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from .models import SessionRPE, DailyLoad
+from teams.models import TeamMembership
+from .models import SessionRPE, DailyLoad, LoadACWR, TrainingSession, WellnessLog
+from .acwr import recompute_acwr_for_members
+from .caching import invalidate_members
+from .cube import refresh_load_cube
+from .series import add_range, refresh_series
+from .weekly import refresh_weekly_loads, week_start
 
-def _recompute_daily_internal_load(membership_id, date):
-    qs = SessionRPE.objects.filter(membership_id=membership_id, session__start__date=date)
-    total = sum(int(x.load_au) for x in qs)
-    DailyLoad.objects.update_or_create(
-        membership_id=membership_id, date=date,
-        defaults={"internal_load_au": total}
+# Work queued by the receivers below and flushed once per commit, so a batch of
+# writes in one transaction rolls up each (membership, date) exactly once.
+_pending = threading.local()
+
+def on_commit_queued(func):
+    """
+    Whether `func` is registered to run when the current transaction commits.
+    A rollback drops the registration, which tells a pending queue that its
+    contents belong to a transaction that never committed.
+    """
+    return any(entry[1] is func for entry in transaction.get_connection().run_on_commit)
+
+def _pending_state(fresh=False):
+    if fresh or not hasattr(_pending, 'days'):
+        _pending.days = set()      # (membership_id, date) needing a DailyLoad rollup
+        _pending.sessions = set()  # (membership_id, session_id) whose date is not resolved yet
+        _pending.acwr = {}         # membership_id -> earliest changed date
+        _pending.changed = set()   # (membership_id, date) of changed DailyLoad rows
+        _pending.wellness = {}     # membership_id -> (first, last) changed WellnessLog dates
+    return _pending
+
+def rollup_daily_internal_load(pairs):
+    """
+    Set-based DailyLoad rollup for an iterable of (membership_id, date):
+    one grouped SUM/COUNT over SessionRPE and one upsert of internal_load_au,
+    sessions and duration_min. Returns the pairs written.
+    """
+    pairs = set(pairs)
+    if not pairs:
+        return pairs
+    dates = [d for _, d in pairs]
+    totals = {
+        (row['membership_id'], row['day']): row
+        for row in (
+            SessionRPE.objects
+            .filter(membership_id__in={m for m, _ in pairs},
+                    session__start__date__range=(min(dates), max(dates)))
+            .annotate(day=TruncDate('session__start'))
+            .values('membership_id', 'day')
+            .annotate(total=Sum('load_au'), sessions=Count('id'), duration=Sum('duration_min'))
+        )
+    }
+    empty = {'total': 0, 'sessions': 0, 'duration': 0}
+    rows = []
+    for m, d in pairs:
+        agg = totals.get((m, d), empty)
+        rows.append(DailyLoad(
+            membership_id=m, date=d, internal_load_au=agg['total'] or 0,
+            sessions=agg['sessions'], duration_min=agg['duration'] or 0,
+        ))
+    DailyLoad.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['membership', 'date'],
+        update_fields=['internal_load_au', 'sessions', 'duration_min'],
     )
+    invalidate_members({m for m, _ in pairs})
+    return pairs
+
+def _recompute_daily_internal_load(membership_id, date):
+    rollup_daily_internal_load([(membership_id, date)])
+
+def _flush_pending():
+    state = _pending_state()
+    days, sessions, acwr, changed, wellness = state.days, state.sessions, state.acwr, state.changed, state.wellness
+    if not (days or sessions or acwr or changed or wellness):
+        return
+    state.days, state.sessions, state.acwr, state.changed, state.wellness = set(), set(), {}, set(), {}
+
+    if sessions:
+        starts = dict(
+            TrainingSession.objects.filter(pk__in={s for _, s in sessions}).values_list('pk', 'start')
+        )
+        days |= {(m, starts[s].date()) for m, s in sessions if s in starts}
+
+    # Cascade deletes (membership, team, user) queue rows of memberships that
+    # are gone by commit time; there is nothing left to roll up for those.
+    live = set(TeamMembership.objects.filter(
+        pk__in={m for m, _ in days} | set(acwr) | {m for m, _ in changed} | set(wellness),
+    ).values_list('pk', flat=True))
+    days = {(m, d) for m, d in days if m in live}
+    acwr = {m: d for m, d in acwr.items() if m in live}
+    changed = {(m, d) for m, d in changed if m in live}
+    wellness = {m: r for m, r in wellness.items() if m in live}
+
+    with transaction.atomic():
+        # bulk upserts fire no post_save, so feed the ACWR / rollup queues directly
+        for m, d in rollup_daily_internal_load(days):
+            if m not in acwr or d < acwr[m]:
+                acwr[m] = d
+            changed.add((m, d))
+        recompute_acwr_for_members(acwr)  # re-syncs its own season series
+        refresh_weekly_loads({(m, week_start(d)) for m, d in changed})
+        refresh_load_cube(changed)
+
+        # Season time-series copies of the changed load days
+        load_ranges = {}
+        for m, d in changed:
+            add_range(load_ranges, m, d, d)
+        refresh_series('load', load_ranges)
+        refresh_series('wellness', wellness)
+
+def _queue():
+    """
+    The pending state of the current transaction. Work left over from a
+    rolled-back transaction (its flush is no longer queued) is dropped rather
+    than flushed with the next commit on this thread.
+    """
+    return _pending_state(fresh=not on_commit_queued(_flush_pending))
+
+def _schedule_flush():
+    # Once per transaction; in autocommit mode this flushes right away.
+    if not on_commit_queued(_flush_pending):
+        transaction.on_commit(_flush_pending)
+
+def schedule_daily_rollup(membership_id, date):
+    _queue().days.add((membership_id, date))
+    _schedule_flush()
+
+def _schedule_load_change(membership_id, date):
+    # A DailyLoad changed: queue its ACWR tail and its week / month / season rollups
+    invalidate_members([membership_id])
+    state = _queue()
+    if membership_id not in state.acwr or date < state.acwr[membership_id]:
+        state.acwr[membership_id] = date
+    state.changed.add((membership_id, date))
+    _schedule_flush()
 
 @receiver(post_save, sender=SessionRPE)
-def on_srpe_save(sender, instance, created, **kwargs):
-    _recompute_daily_internal_load(instance.membership_id, instance.session.start.date())
+def on_srpe_save(sender, instance, created, raw=False, **kwargs):
+    if raw:  # fixture loading
+        return
+    if SessionRPE.session.is_cached(instance):
+        schedule_daily_rollup(instance.membership_id, instance.session.start.date())
+    else:
+        # Resolve the date at commit time, together with every other queued session
+        _queue().sessions.add((instance.membership_id, instance.session_id))
+        _schedule_flush()
 
 @receiver(post_delete, sender=SessionRPE)
 def on_srpe_delete(sender, instance, **kwargs):
-    _recompute_daily_internal_load(instance.membership_id, instance.session.start.date())
+    # The session may be cascade-deleted by commit time, so resolve the date now
+    if SessionRPE.session.is_cached(instance):
+        start = instance.session.start
+    else:
+        start = TrainingSession.objects.filter(pk=instance.session_id).values_list('start', flat=True).first()
+    if start:
+        schedule_daily_rollup(instance.membership_id, start.date())
+
+@receiver(post_save, sender=DailyLoad)
+def on_daily_load_save(sender, instance, raw=False, **kwargs):
+    if raw:  # fixture loading
+        return
+    _schedule_load_change(instance.membership_id, instance.date)
+
+@receiver(post_delete, sender=DailyLoad)
+def on_daily_load_delete(sender, instance, **kwargs):
+    _schedule_load_change(instance.membership_id, instance.date)
+
+@receiver(post_save, sender=LoadACWR)
+@receiver(post_delete, sender=LoadACWR)
+def on_load_acwr_change(sender, instance, **kwargs):
+    # Single-row writes only; the bulk upserts in acwr.py invalidate themselves
+    invalidate_members([instance.membership_id])
+
+def _schedule_wellness_change(membership_id, date):
+    add_range(_queue().wellness, membership_id, date, date)
+    _schedule_flush()
+
+@receiver(post_save, sender=WellnessLog)
+def on_wellness_log_save(sender, instance, raw=False, **kwargs):
+    if raw:  # fixture loading
+        return
+    # `date` defaults to timezone.now, which stays a datetime on the instance
+    _schedule_wellness_change(instance.membership_id, sender._meta.get_field('date').to_python(instance.date))
+
+@receiver(post_delete, sender=WellnessLog)
+def on_wellness_log_delete(sender, instance, **kwargs):
+    _schedule_wellness_change(instance.membership_id, sender._meta.get_field('date').to_python(instance.date))
@@ -1,3 +1,41 @@
-from django.test import TestCase
+import numpy as np
+from django.test import SimpleTestCase
 
-# Create your tests here.
+from .acwr import (
+    ACUTE_HALFLIFE_DAYS, CHRONIC_HALFLIFE_DAYS, alpha_from_halflife, compute_acwr_rows, ewma, ewma_series,
+)
+
+
+def ewma_loop(x, alpha, initial):
+    out, prev = [], initial
+    for x_t in x:
+        prev = ewma(prev, x_t, alpha)
+        out.append(prev)
+    return np.array(out)
+
+
+class EwmaTests(SimpleTestCase):
+    """
+    Stored ACWR must match the day-by-day `ewma` loop bit for bit.
+    """
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.loads = rng.integers(0, 1500, size=(5, 1000)).astype(float)
+        self.alphas = [alpha_from_halflife(ACUTE_HALFLIFE_DAYS), alpha_from_halflife(CHRONIC_HALFLIFE_DAYS)]
+
+    def test_ewma_series_matches_loop_exactly(self):
+        for alpha in self.alphas:
+            for initial in (0.0, 412.37):
+                self.assertTrue(np.array_equal(
+                    ewma_series(self.loads[0], alpha, initial), ewma_loop(self.loads[0], alpha, initial),
+                ))
+
+    def test_batched_rows_match_loop_exactly(self):
+        acute0, chronic0 = [10.0, 0.0, 250.5, 99.9, 1.0], [20.0, 0.0, 300.25, 80.0, 3.0]
+        acute, chronic, _ = compute_acwr_rows(self.loads, acute0, chronic0)
+        for i, x in enumerate(self.loads):
+            self.assertTrue(np.array_equal(acute[i], ewma_loop(x, self.alphas[0], acute0[i])))
+            self.assertTrue(np.array_equal(chronic[i], ewma_loop(x, self.alphas[1], chronic0[i])))
+
+    def test_empty_series(self):
+        self.assertEqual(ewma_series([], self.alphas[0]).shape, (0,))
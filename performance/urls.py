@@ -0,0 +1,20 @@
+from django.urls import path
+from .views import (
+    SessionRPEBulkView, GPSImportView, HRVImportView, TeamACWRSeriesView,
+    TeamWeeklyLoadView, TeamLoadCubeView, TeamSeasonSeriesView,
+    TeamRiskFlagView, TeamACWRProjectionView, MemberLoadSeriesView, SeriesCacheStatsView,
+)
+
+urlpatterns = [
+    path('sessions/<int:session_id>/srpe/', SessionRPEBulkView.as_view(), name='session_srpe_bulk'),
+    path('gps/import/', GPSImportView.as_view(), name='gps_import'),
+    path('hrv/import/', HRVImportView.as_view(), name='hrv_import'),
+    path('teams/<int:team_id>/acwr/', TeamACWRSeriesView.as_view(), name='team_acwr_series'),
+    path('teams/<int:team_id>/acwr/projection/', TeamACWRProjectionView.as_view(), name='team_acwr_projection'),
+    path('teams/<int:team_id>/weekly/', TeamWeeklyLoadView.as_view(), name='team_weekly_load'),
+    path('teams/<int:team_id>/load-cube/', TeamLoadCubeView.as_view(), name='team_load_cube'),
+    path('teams/<int:team_id>/series/', TeamSeasonSeriesView.as_view(), name='team_season_series'),
+    path('teams/<int:team_id>/flags/', TeamRiskFlagView.as_view(), name='team_risk_flags'),
+    path('members/<int:membership_id>/series/', MemberLoadSeriesView.as_view(), name='member_load_series'),
+    path('cache/stats/', SeriesCacheStatsView.as_view(), name='series_cache_stats'),
+]
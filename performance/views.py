@@ -0,0 +1,516 @@
+from datetime import timedelta
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count, Max
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from rest_framework import generics, status
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from teams.models import Team, TeamMembership, Season
+from users.permissions import IsAdmin, IsCoachOrAdmin, IsOwnerOrCoachOrAdmin
+
+from .gps import PROVIDER_COLUMNS as GPS_PROVIDERS, import_gps_exports
+from .hrv import PROVIDER_COLUMNS as HRV_PROVIDERS, import_hrv_exports
+from .caching import cache_stats, cached_series, reset_cache_stats
+from .columnar import date_axis, date_range_from_request, dense_matrix, etag_for, matrix_to_json
+from .cube import MEASURES as CUBE_MEASURES, range_totals
+from .models import TrainingSession, SessionRPE, DailyLoad, LoadACWR, WeeklyLoad, TeamWeeklyLoad, LoadRollup, SeriesMetric, RiskFlag
+from .projection import project_team_acwr
+from .serializers import ACWRProjectionSerializer, RiskFlagSerializer, SessionRPEBulkSerializer
+from .series import read_matrix
+from .signals import schedule_daily_rollup
+from .weekly import week_start
+
+
+class SessionRPEBulkView(generics.GenericAPIView):
+    """
+    POST /api/performance/sessions/<session_id>/srpe/
+    Upserts the sRPE of every listed athlete for one TrainingSession in a single
+    statement. load_au = round(rpe_0_10 * duration_min) is computed server-side.
+    DailyLoad and ACWR are refreshed once, after commit.
+    Coach/Owner/Admin of the session's team only.
+    """
+    serializer_class = SessionRPEBulkSerializer
+    permission_classes = [IsAuthenticated, IsOwnerOrCoachOrAdmin]
+
+    def get_object(self):
+        session = get_object_or_404(TrainingSession, pk=self.kwargs["session_id"])
+        self.check_object_permissions(self.request, session)
+        return session
+
+    def post(self, request, *args, **kwargs):
+        session = self.get_object()
+        ser = SessionRPEBulkSerializer(data=request.data, context={"session": session})
+        ser.is_valid(raise_exception=True)
+        entries = ser.validated_data["entries"]
+
+        rpe = np.array([float(e["rpe_0_10"]) for e in entries])
+        duration = np.array([e["duration_min"] for e in entries])
+        loads = np.rint(rpe * duration).astype(int).tolist()
+
+        rows = [
+            SessionRPE(
+                session=session, membership_id=e["membership"],
+                rpe_0_10=e["rpe_0_10"], duration_min=e["duration_min"], load_au=load,
+            )
+            for e, load in zip(entries, loads)
+        ]
+        day = session.start.date()
+        with transaction.atomic():
+            SessionRPE.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=["session", "membership"],
+                update_fields=["rpe_0_10", "duration_min", "load_au"],
+            )
+            # bulk_create sends no post_save; queue the rollups explicitly
+            for row in rows:
+                schedule_daily_rollup(row.membership_id, day)
+
+        return Response(
+            {
+                "session": session.id,
+                "date": day,
+                "entries": [
+                    {
+                        "membership": r.membership_id,
+                        "rpe_0_10": str(r.rpe_0_10),
+                        "duration_min": r.duration_min,
+                        "load_au": r.load_au,
+                    }
+                    for r in rows
+                ],
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class GPSImportView(generics.GenericAPIView):
+    """
+    POST /api/performance/gps/import/  (multipart)
+    Fields: provider=CATAPULT|STATSPORTS, file=<csv> (repeatable).
+    Streams the exports and writes DailyLoad.external_load_pl per member per day.
+    Coaches only write memberships of their active teams; admins any team.
+    """
+    permission_classes = [IsAuthenticated, IsCoachOrAdmin]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request, *args, **kwargs):
+        provider = request.data.get("provider")
+        if provider not in GPS_PROVIDERS:
+            return Response({"provider": [f"Must be one of: {', '.join(GPS_PROVIDERS)}."]}, status=400)
+        files = request.FILES.getlist("file")
+        if not files:
+            return Response({"file": ["At least one file is required."]}, status=400)
+
+        team_ids = None
+        if not request.user.is_admin():
+            team_ids = list(
+                TeamMembership.objects.filter(user=request.user, active=True).values_list("team_id", flat=True)
+            )
+        try:
+            summary = import_gps_exports(provider, [f.file for f in files], team_ids=team_ids)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=400)
+        return Response(summary, status=status.HTTP_200_OK)
+
+
+class HRVImportView(generics.GenericAPIView):
+    """
+    POST /api/performance/hrv/import/  (multipart)
+    Fields: provider=WHOOP|OURA, file=<csv> (repeatable), membership=<id> for
+    personal exports without an athlete column.
+    Coaches only write memberships of their active teams; admins any team.
+    """
+    permission_classes = [IsAuthenticated, IsCoachOrAdmin]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request, *args, **kwargs):
+        provider = request.data.get("provider")
+        if provider not in HRV_PROVIDERS:
+            return Response({"provider": [f"Must be one of: {', '.join(HRV_PROVIDERS)}."]}, status=400)
+        files = request.FILES.getlist("file")
+        if not files:
+            return Response({"file": ["At least one file is required."]}, status=400)
+
+        membership_id = request.data.get("membership") or None
+        team_ids = None
+        if not request.user.is_admin():
+            team_ids = list(
+                TeamMembership.objects.filter(user=request.user, active=True).values_list("team_id", flat=True)
+            )
+        if membership_id is not None:
+            memberships = TeamMembership.objects.filter(pk=membership_id)
+            if team_ids is not None:
+                memberships = memberships.filter(team_id__in=team_ids)
+            if not str(membership_id).isdigit() or not memberships.exists():
+                return Response({"membership": ["Unknown membership or not on your team."]}, status=400)
+            membership_id = int(membership_id)
+
+        try:
+            summary = import_hrv_exports(
+                provider, [f.file for f in files], membership_id=membership_id, team_ids=team_ids
+            )
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=400)
+        return Response(summary, status=status.HTTP_200_OK)
+
+
+class TeamACWRSeriesView(generics.GenericAPIView):
+    """
+    GET /api/performance/teams/<team_id>/acwr/?from=YYYY-MM-DD&to=YYYY-MM-DD&season=<id>&source=INTERNAL
+    Columnar squad ACWR: a shared `dates` axis, the `members` axis, and for each
+    of acute / chronic / ratio one array per member (null = no value that day).
+    Built from one LoadACWR query on (membership, date). Supports ETag /
+    Last-Modified conditional GET.
+    """
+    permission_classes = [IsAuthenticated, IsOwnerOrCoachOrAdmin]
+
+    def get(self, request, team_id, *args, **kwargs):
+        team = get_object_or_404(Team, pk=team_id)
+        self.check_object_permissions(request, team)
+
+        season_id = request.query_params.get("season")
+        season = Season.objects.filter(pk=season_id).first() if season_id else None
+        try:
+            start, end = date_range_from_request(request, default_days=28, season=season)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=400)
+        source = request.query_params.get("source", "INTERNAL")
+
+        members = list(team.get_squad(season).order_by("id"))
+        ids = [m.id for m in members]
+        dates = date_axis(start, end)
+
+        def read():
+            qs = LoadACWR.objects.filter(membership_id__in=ids, source=source, date__range=(start, end))
+            fp = qs.aggregate(n=Count("id"), last=Max("updated_at"))
+            matrix = dense_matrix(
+                qs.values_list("membership_id", "date", "acute_ewma", "chronic_ewma", "ratio"),
+                ids, start, len(dates), 3,
+            )
+            return {
+                "n": fp["n"],
+                "last": int(fp["last"].timestamp()) if fp["last"] else None,
+                "series": matrix_to_json(matrix, decimals=4),
+            }
+
+        # Cached per squad + range until one of the members' loads changes
+        data = cached_series("team_acwr", ids, start, end, read, extra=(source,))
+        etag = etag_for(team.id, ids, start, end, source, data["n"], data["last"])
+        last_modified = data["last"]
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+        acute, chronic, ratio = data["series"]
+        response = Response({
+            "team": team.id,
+            "source": source,
+            "dates": dates,
+            "members": [
+                {
+                    "membership": m.id,
+                    "user": m.user_id,
+                    "name": m.user.get_full_name(),
+                    "jersey_number": m.jersey_number,
+                }
+                for m in members
+            ],
+            "acute": acute,
+            "chronic": chronic,
+            "ratio": ratio,
+        })
+        response["ETag"] = etag
+        if last_modified:
+            response["Last-Modified"] = http_date(last_modified)
+        return response
+
+
+class TeamACWRProjectionView(generics.GenericAPIView):
+    """
+    POST /api/performance/teams/<team_id>/acwr/projection/
+    What-if ACWR for the squad over the next `days` (default 14, from tomorrow),
+    rolled forward from the latest stored EWMA state with the team's planned
+    TRAINING / MATCH calendar events (estimated RPE x duration). Nothing is
+    saved. Columnar like the ACWR series, plus the `sessions` used.
+    """
+    serializer_class = ACWRProjectionSerializer
+    permission_classes = [IsAuthenticated, IsOwnerOrCoachOrAdmin]
+
+    def post(self, request, team_id, *args, **kwargs):
+        team = get_object_or_404(Team, pk=team_id)
+        self.check_object_permissions(request, team)
+        ser = ACWRProjectionSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        data = ser.validated_data
+        start = data.get("start") or timezone.localdate() + timedelta(days=1)
+
+        members, sessions, loads, acute, chronic, ratio = project_team_acwr(
+            team, start, data["days"],
+            default_rpe=data.get("default_rpe"),
+            overrides={s["event"]: s for s in data.get("sessions", [])},
+        )
+        acute, chronic, ratio = matrix_to_json(np.stack([acute, chronic, ratio]), decimals=4)
+        return Response({
+            "team": team.id,
+            "dates": date_axis(start, start + timedelta(days=data["days"] - 1)),
+            "sessions": sessions,
+            "members": [
+                {"membership": m.id, "user": m.user_id, "name": m.user.get_full_name(), "state_date": m.state_date}
+                for m in members
+            ],
+            "load_au": loads.astype(int).tolist(),
+            "acute": acute,
+            "chronic": chronic,
+            "ratio": ratio,
+        })
+
+
+class TeamWeeklyLoadView(generics.GenericAPIView):
+    """
+    GET /api/performance/teams/<team_id>/weekly/?from=YYYY-MM-DD&to=YYYY-MM-DD&season=<id>
+    Precomputed Foster weekly load / monotony / strain, columnar over Monday weeks:
+      - `team`: {"ALL" | "GK" | "DF" | "MF" | "FW": {members, total_load_au, mean_load_au, mean_monotony, mean_strain}}
+      - per member: total_load_au / monotony / strain arrays aligned with `members`.
+    """
+    permission_classes = [IsAuthenticated, IsOwnerOrCoachOrAdmin]
+
+    def get(self, request, team_id, *args, **kwargs):
+        team = get_object_or_404(Team, pk=team_id)
+        self.check_object_permissions(request, team)
+
+        season_id = request.query_params.get("season")
+        season = Season.objects.filter(pk=season_id).first() if season_id else None
+        try:
+            start, end = date_range_from_request(request, default_days=12 * 7, season=season)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=400)
+        start, end = week_start(start), week_start(end)
+        weeks = date_axis(start, end, step_days=7)
+
+        members = list(team.get_squad(season).order_by("id"))
+        ids = [m.id for m in members]
+        matrix = dense_matrix(
+            WeeklyLoad.objects.filter(membership_id__in=ids, week_start__range=(start, end))
+            .values_list("membership_id", "week_start", "total_load_au", "monotony", "strain"),
+            ids, start, len(weeks), 3, step_days=7,
+        )
+        total, monotony, strain = matrix_to_json(matrix, decimals=3)
+
+        fields = ["members", "total_load_au", "mean_load_au", "mean_monotony", "mean_strain"]
+        lines = {}
+        for row in TeamWeeklyLoad.objects.filter(team=team, week_start__range=(start, end)).values("line", "week_start", *fields):
+            series = lines.setdefault(row["line"], {f: [None] * len(weeks) for f in fields})
+            j = (row["week_start"] - start).days // 7
+            for f in fields:
+                series[f][j] = round(row[f], 3) if isinstance(row[f], float) else row[f]
+
+        return Response({
+            "team": team.id,
+            "weeks": weeks,
+            "lines": lines,
+            "members": [
+                {"membership": m.id, "user": m.user_id, "name": m.user.get_full_name(),
+                 "line": m.primary_position.line if m.primary_position else None}
+                for m in members
+            ],
+            "total_load_au": total,
+            "monotony": monotony,
+            "strain": strain,
+        })
+
+
+class TeamLoadCubeView(generics.GenericAPIView):
+    """
+    GET /api/performance/teams/<team_id>/load-cube/?grain=week|month|season|range&scope=member|line|team&from=&to=
+    Precomputed load totals (internal AU, external PlayerLoad, sessions, minutes,
+    active days), columnar: one array per key (membership id / position line /
+    "ALL") over `periods`. grain=range returns one total per key for exactly
+    [from, to], composed from whole seasons, whole months and the edge days.
+    """
+    permission_classes = [IsAuthenticated, IsOwnerOrCoachOrAdmin]
+    GRAINS = {"week": LoadRollup.WEEK, "month": LoadRollup.MONTH, "season": LoadRollup.SEASON, "range": None}
+    SCOPES = {"member": LoadRollup.MEMBER, "line": LoadRollup.LINE, "team": LoadRollup.TEAM}
+
+    def get(self, request, team_id, *args, **kwargs):
+        team = get_object_or_404(Team, pk=team_id)
+        self.check_object_permissions(request, team)
+
+        grain_param = request.query_params.get("grain", "week")
+        scope_param = request.query_params.get("scope", "team")
+        if grain_param not in self.GRAINS:
+            return Response({"detail": f"grain must be one of: {', '.join(self.GRAINS)}."}, status=400)
+        if scope_param not in self.SCOPES:
+            return Response({"detail": f"scope must be one of: {', '.join(self.SCOPES)}."}, status=400)
+        grain, scope = self.GRAINS[grain_param], self.SCOPES[scope_param]
+        try:
+            start, end = date_range_from_request(request, default_days=12 * 7)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=400)
+
+        payload = {"team": team.id, "grain": grain_param, "scope": scope_param, "from": start, "to": end}
+        if grain is None:
+            totals = range_totals(team.id, scope, start, end)
+            keys = sorted(totals, key=str)
+            payload["keys"] = keys
+            payload.update({f: [totals[k][f] for k in keys] for f in CUBE_MEASURES})
+            return Response(payload)
+
+        key_field = {LoadRollup.MEMBER: "membership_id", LoadRollup.LINE: "line"}.get(scope)
+        rows = list(
+            LoadRollup.objects
+            .filter(team=team, grain=grain, scope=scope, period_start__lte=end, period_end__gte=start)
+            .order_by("period_start")
+            .values(*([key_field] if key_field else []), "period_start", "period_end", *CUBE_MEASURES)
+        )
+        periods = sorted({(r["period_start"], r["period_end"]) for r in rows})
+        column = {p: j for j, p in enumerate(periods)}
+        series = {}
+        for r in rows:
+            k = r[key_field] if key_field else "ALL"
+            values = series.setdefault(k, {f: [None] * len(periods) for f in CUBE_MEASURES})
+            j = column[(r["period_start"], r["period_end"])]
+            for f in CUBE_MEASURES:
+                values[f][j] = r[f]
+        keys = sorted(series, key=str)
+        payload["periods"] = [{"start": lo, "end": hi} for lo, hi in periods]
+        payload["keys"] = keys
+        payload.update({f: [series[k][f] for k in keys] for f in CUBE_MEASURES})
+        return Response(payload)
+
+
+class TeamSeasonSeriesView(generics.GenericAPIView):
+    """
+    GET /api/performance/teams/<team_id>/series/?season=<id>&metrics=internal_load_au,acwr_ratio&from=&to=
+    Columnar squad metrics read from the packed SeasonSeries store: a `dates`
+    axis, the `members` axis and per metric one array per member (null = no
+    value). One query for the whole squad and season.
+    """
+    permission_classes = [IsAuthenticated, IsOwnerOrCoachOrAdmin]
+
+    def get(self, request, team_id, *args, **kwargs):
+        team = get_object_or_404(Team, pk=team_id)
+        self.check_object_permissions(request, team)
+
+        season_id = request.query_params.get("season")
+        season = (
+            Season.objects.filter(pk=season_id).first() if season_id
+            else Season.objects.filter(is_current=True).first()
+        )
+        if season is None:
+            return Response({"detail": "Unknown season."}, status=400)
+        metrics = request.query_params.get("metrics", SeriesMetric.INTERNAL_LOAD).split(",")
+        unknown = [m for m in metrics if m not in SeriesMetric.values]
+        if unknown:
+            return Response({"detail": f"Unknown metrics: {', '.join(unknown)}."}, status=400)
+        try:
+            start, end = date_range_from_request(request, default_days=0, season=season)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=400)
+        start, end = max(start, season.start_date), min(end, season.end_date)
+
+        members = list(team.get_squad(season).order_by("id"))
+        # float32 in storage; widen before rounding so the JSON stays clean
+        matrix = read_matrix([m.id for m in members], season, metrics, start, end).astype(np.float64)
+        return Response({
+            "team": team.id,
+            "season": season.id,
+            "dates": date_axis(start, end),
+            "members": [
+                {"membership": m.id, "user": m.user_id, "name": m.user.get_full_name()}
+                for m in members
+            ],
+            **dict(zip(metrics, matrix_to_json(matrix, decimals=4))),
+        })
+
+
+class TeamRiskFlagView(generics.GenericAPIView):
+    """
+    GET /api/performance/teams/<team_id>/flags/?severity=HIGH
+    Active risk flags of the team (expires_on >= today), newest first, read
+    with one query on the (team, expires_on) index. Flags are produced by the
+    evaluate_risk_flags batch command.
+    """
+    serializer_class = RiskFlagSerializer
+    permission_classes = [IsAuthenticated, IsOwnerOrCoachOrAdmin]
+
+    def get(self, request, team_id, *args, **kwargs):
+        team = get_object_or_404(Team, pk=team_id)
+        self.check_object_permissions(request, team)
+
+        qs = (
+            RiskFlag.objects
+            .filter(team=team, expires_on__gte=timezone.localdate())
+            .select_related("membership__user")
+        )
+        severity = request.query_params.get("severity")
+        if severity:
+            qs = qs.filter(severity=severity.upper())
+        return Response(RiskFlagSerializer(qs, many=True).data)
+
+
+class MemberLoadSeriesView(generics.GenericAPIView):
+    """
+    GET /api/performance/members/<membership_id>/series/?from=YYYY-MM-DD&to=YYYY-MM-DD
+    One member's daily internal / external load and INTERNAL ACWR over a date
+    range, aligned on `dates` (null = no row). Cached until the member's
+    DailyLoad / LoadACWR rows change.
+    The player themself, or Coach/Owner/Admin of the membership's team.
+    """
+    permission_classes = [IsAuthenticated, IsOwnerOrCoachOrAdmin]
+
+    def get(self, request, membership_id, *args, **kwargs):
+        membership = get_object_or_404(TeamMembership.objects.select_related("team", "user"), pk=membership_id)
+        self.check_object_permissions(request, membership)
+        try:
+            start, end = date_range_from_request(request, default_days=28)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=400)
+        dates = date_axis(start, end)
+
+        def read():
+            loads = dense_matrix(
+                DailyLoad.objects.filter(membership=membership, date__range=(start, end))
+                .values_list("membership_id", "date", "internal_load_au", "external_load_pl"),
+                [membership.id], start, len(dates), 2,
+            )
+            acwr = dense_matrix(
+                LoadACWR.objects.filter(membership=membership, source="INTERNAL", date__range=(start, end))
+                .values_list("membership_id", "date", "acute_ewma", "chronic_ewma", "ratio"),
+                [membership.id], start, len(dates), 3,
+            )
+            internal, external = (row[0] for row in matrix_to_json(loads))
+            acute, chronic, ratio = (row[0] for row in matrix_to_json(acwr, decimals=4))
+            return {
+                "internal_load_au": internal, "external_load_pl": external,
+                "acute": acute, "chronic": chronic, "ratio": ratio,
+            }
+
+        return Response({
+            "membership": membership.id,
+            "dates": dates,
+            **cached_series("member_load", [membership.id], start, end, read),
+        })
+
+
+class SeriesCacheStatsView(generics.GenericAPIView):
+    """
+    GET /api/performance/cache/stats/      -> {"hits", "misses", "hit_ratio"}
+    DELETE /api/performance/cache/stats/   -> reset the counters
+    Admin only.
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request, *args, **kwargs):
+        return Response(cache_stats())
+
+    def delete(self, request, *args, **kwargs):
+        reset_cache_stats()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,123 @@
+# performance/weekly.py
+"""
+Foster weekly load, monotony and strain, kept incrementally from DailyLoad.
+
+Member weeks are recomputed as one (weeks x 7) NumPy matrix and upserted in
+bulk; squad and position-line aggregates for the touched (team, week) pairs are
+then rebuilt from WeeklyLoad with two grouped queries.
+"""
+from datetime import timedelta
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Avg, Count, Sum
+
+from teams.models import TeamMembership
+from .models import DailyLoad, TeamWeeklyLoad, WeeklyLoad
+
+UPSERT_BATCH_SIZE = 1000
+
+
+def week_start(day):
+    return day - timedelta(days=day.weekday())
+
+
+def foster_stats(X):
+    """
+    X: (weeks, 7) daily loads. Returns total, mean, sd, monotony, strain arrays;
+    monotony/strain are NaN where the daily SD is 0.
+    """
+    total = X.sum(axis=1)
+    mean = total / 7
+    sd = X.std(axis=1, ddof=1)
+    monotony = np.divide(mean, sd, out=np.full_like(mean, np.nan), where=sd > 0)
+    strain = total * monotony
+    return total, mean, sd, monotony, strain
+
+
+def _none_if_nan(x):
+    return None if np.isnan(x) else float(x)
+
+
+def refresh_weekly_loads(pairs):
+    """
+    Recompute WeeklyLoad for an iterable of (membership_id, week_start) and the
+    team aggregates of those weeks. Returns the number of member weeks written.
+    """
+    pairs = set(pairs)
+    if not pairs:
+        return 0
+    # Memberships deleted since the pairs were queued have no weeks left to write
+    team_of = dict(TeamMembership.objects.filter(id__in={m for m, _ in pairs}).values_list('id', 'team_id'))
+    pairs = sorted(p for p in pairs if p[0] in team_of)
+    if not pairs:
+        return 0
+    ids = {m for m, _ in pairs}
+    index = {p: i for i, p in enumerate(pairs)}
+
+    X = np.zeros((len(pairs), 7))
+    for m, d, load in (
+        DailyLoad.objects
+        .filter(membership_id__in=ids,
+                date__range=(min(w for _, w in pairs), max(w for _, w in pairs) + timedelta(days=6)))
+        .values_list('membership_id', 'date', 'internal_load_au')
+    ):
+        i = index.get((m, week_start(d)))
+        if i is not None:
+            X[i, d.weekday()] = load
+
+    total, mean, sd, monotony, strain = foster_stats(X)
+    rows = [
+        WeeklyLoad(
+            membership_id=m, week_start=w, total_load_au=int(total[i]),
+            mean_daily_au=float(mean[i]), sd_daily_au=float(sd[i]),
+            monotony=_none_if_nan(monotony[i]), strain=_none_if_nan(strain[i]),
+        )
+        for i, (m, w) in enumerate(pairs)
+    ]
+    with transaction.atomic():
+        WeeklyLoad.objects.bulk_create(
+            rows,
+            batch_size=UPSERT_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['membership', 'week_start'],
+            update_fields=['total_load_au', 'mean_daily_au', 'sd_daily_au', 'monotony', 'strain'],
+        )
+        refresh_team_weekly_loads({team_of[m] for m in ids}, {w for _, w in pairs})
+    return len(rows)
+
+
+def refresh_team_weekly_loads(team_ids, weeks):
+    """
+    Rebuild TeamWeeklyLoad (squad + each position line) for every team x week given.
+    """
+    if not team_ids or not weeks:
+        return 0
+    qs = WeeklyLoad.objects.filter(
+        membership__team_id__in=team_ids, membership__role_on_team='PLAYER', week_start__in=weeks,
+    )
+    metrics = dict(
+        n=Count('id'), total=Sum('total_load_au'), mean=Avg('total_load_au'),
+        mono=Avg('monotony'), strain=Avg('strain'),
+    )
+    groups = [
+        (r['membership__team_id'], r['week_start'], TeamWeeklyLoad.ALL, r)
+        for r in qs.values('membership__team_id', 'week_start').annotate(**metrics)
+    ] + [
+        (r['membership__team_id'], r['week_start'], r['membership__primary_position__line'], r)
+        for r in qs.values('membership__team_id', 'week_start', 'membership__primary_position__line')
+        .annotate(**metrics)
+        if r['membership__primary_position__line']
+    ]
+    rows = [
+        TeamWeeklyLoad(
+            team_id=team_id, week_start=w, line=line, members=r['n'], total_load_au=r['total'] or 0,
+            mean_load_au=r['mean'] or 0, mean_monotony=r['mono'], mean_strain=r['strain'],
+        )
+        for team_id, w, line, r in groups
+    ]
+    with transaction.atomic():
+        # Lines can empty out (position changes), so replace rather than upsert
+        TeamWeeklyLoad.objects.filter(team_id__in=team_ids, week_start__in=weeks).delete()
+        TeamWeeklyLoad.objects.bulk_create(rows, batch_size=UPSERT_BATCH_SIZE)
+    return len(rows)
@@ -0,0 +1,101 @@
+# wellness/baselines.py
+"""
+Per-player wellness baselines and z-scores.
+
+Raw 1-5 answers are compared with the same player's previous BASELINE_WINDOW_DAYS
+days: z = (score - mean) / max(sd, MIN_SD). The baseline (mean, sample SD) and
+the z-score are stored on each DailyWellnessEntry, like the HRV baselines on
+DailyHRV, so overview and history reads need no window maths and show what
+every z-score was measured against.
+
+A changed entry moves the baseline of the entries in the following window, so
+a refresh covers the changed days plus that window: one SELECT and one bulk
+update for any number of players.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+import numpy as np
+
+from performance.hrv import rolling_baseline
+from .models import DailyWellnessEntry
+
+UPSERT_BATCH_SIZE = 1000
+BASELINE_WINDOW_DAYS = 28
+BASELINE_MIN_DAYS = 7  # fewer entries in the window -> no z-score
+MIN_SD = 0.5           # constant answers give SD 0; keep z finite and damp 1-point wobble
+
+# score field -> stored z-score field
+METRICS = {
+    'sleep_quality': 'sleep_quality_z',
+    'mood_score': 'mood_score_z',
+    'soreness_score': 'soreness_score_z',
+    'fatigue_score': 'fatigue_score_z',
+}
+Z_FIELDS = tuple(METRICS.values())
+# score field -> stored (mean, sd) baseline fields
+BASELINES = {score: (f'{score}_mean_28d', f'{score}_sd_28d') for score in METRICS}
+BASELINE_FIELDS = tuple(f for fields in BASELINES.values() for f in fields)
+
+
+def trailing_baseline(values, window=BASELINE_WINDOW_DAYS, min_count=BASELINE_MIN_DAYS):
+    """
+    (mean, sd, z) for every day of a dense daily series (NaN = no entry): the
+    mean and sample SD of the previous `window` days and the day's z-score
+    against them. NaN where the window holds fewer than min_count entries; z
+    is also NaN where the day has no value.
+    """
+    previous = np.concatenate([[np.nan], values[:-1]])
+    mean, sd, _ = rolling_baseline(previous, window=window, min_count=min_count)
+    with np.errstate(invalid='ignore'):
+        return mean, sd, (values - mean) / np.fmax(sd, MIN_SD)
+
+
+def _none_if_nan(x):
+    return None if np.isnan(x) else round(float(x), 3)
+
+
+def refresh_wellness_baselines(ranges):
+    """
+    Recompute stored baselines and z-scores for {player_id: (first_date,
+    last_date)}: every entry in the range and in the window after it. Returns
+    the entries written.
+    """
+    if not ranges:
+        return 0
+    span = timedelta(days=BASELINE_WINDOW_DAYS)
+    lo = min(first for first, _ in ranges.values()) - span
+    hi = max(last for _, last in ranges.values()) + span
+
+    by_player = defaultdict(list)
+    for entry in (
+        DailyWellnessEntry.objects
+        .filter(player_id__in=list(ranges), entry_date__range=(lo, hi))
+        .only('id', 'player_id', 'entry_date', *METRICS)
+        .order_by('entry_date')
+    ):
+        by_player[entry.player_id].append(entry)
+
+    updated = []
+    for player_id, entries in by_player.items():
+        first, last = ranges[player_id]
+        start = first - span
+        X = np.full((len(METRICS), (last + span - start).days + 1), np.nan)
+        targets = []
+        for e in entries:
+            if start <= e.entry_date <= last + span:
+                i = (e.entry_date - start).days
+                X[:, i] = [np.nan if getattr(e, f) is None else getattr(e, f) for f in METRICS]
+                if e.entry_date >= first:
+                    targets.append((i, e))
+        stats = [trailing_baseline(x) for x in X]
+        for i, e in targets:
+            for (score, z_field), (mean, sd, z) in zip(METRICS.items(), stats):
+                mean_field, sd_field = BASELINES[score]
+                setattr(e, mean_field, _none_if_nan(mean[i]))
+                setattr(e, sd_field, _none_if_nan(sd[i]))
+                setattr(e, z_field, _none_if_nan(z[i]))
+            updated.append(e)
+
+    DailyWellnessEntry.objects.bulk_update(updated, Z_FIELDS + BASELINE_FIELDS, batch_size=UPSERT_BATCH_SIZE)
+    return len(updated)
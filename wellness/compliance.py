@@ -0,0 +1,98 @@
+# wellness/compliance.py
+"""
+Wellness compliance: who has not submitted, per team, over a date range.
+
+One query for every team in scope. Active PLAYER memberships are LEFT JOINed to
+their DailyWellnessEntry rows inside the range (the range sits in the join
+condition, so the (player, entry_date) unique index bounds it) and grouped per
+membership. A membership whose join comes back empty, or short of the days it
+was expected to submit, is missing: the anti-join, counted.
+"""
+from django.db.models import Count, FilteredRelation, Q
+from django.utils import timezone
+
+from performance.weekly import week_start
+from teams.models import Team, TeamMembership
+
+MAX_RANGE_DAYS = 31
+
+
+def period_range(period, today=None):
+    """
+    (start, end) of 'today' or 'week' (Monday up to today).
+    """
+    today = today or timezone.localdate()
+    if period == 'today':
+        return today, today
+    if period == 'week':
+        return week_start(today), today
+    raise ValueError("period must be 'today' or 'week'.")
+
+
+def visible_team_ids(user):
+    """
+    Teams whose compliance `user` may see: every team for admins, otherwise the
+    teams they coach (active COACH membership) or own.
+    """
+    teams = Team.objects.all()
+    if not user.is_admin():
+        teams = teams.filter(
+            Q(memberships__user=user, memberships__role_on_team='COACH', memberships__active=True)
+            | Q(owner=user)
+        )
+    return list(teams.order_by('id').values_list('id', flat=True).distinct())
+
+
+def expected_days(membership, start, end):
+    """
+    Days in [start, end] the membership covers (start_date / end_date, when set).
+    """
+    lo = max(start, membership['start_date'] or start)
+    hi = min(end, membership['end_date'] or end)
+    return max(0, (hi - lo).days + 1)
+
+
+def compliance_report(team_ids, start, end):
+    """
+    [{team, team_name, players, expected, submitted, rate, missing: [...]}] for
+    the given teams over [start, end], ordered by team id; teams without active
+    players are left out. `missing` lists the players with fewer submissions
+    than expected days.
+    """
+    rows = (
+        TeamMembership.objects
+        .filter(team_id__in=team_ids, active=True, role_on_team='PLAYER')
+        .annotate(in_range=FilteredRelation(
+            'user__wellness_entries',
+            condition=Q(user__wellness_entries__entry_date__range=(start, end)),
+        ))
+        .values('id', 'team_id', 'team__name', 'user_id', 'user__first_name', 'user__last_name',
+                'jersey_number', 'start_date', 'end_date')
+        .annotate(submitted=Count('in_range'))
+        .order_by('team_id', 'jersey_number', 'id')
+    )
+
+    teams = {}
+    for r in rows:
+        team = teams.setdefault(r['team_id'], {
+            'team': r['team_id'], 'team_name': r['team__name'],
+            'players': 0, 'expected': 0, 'submitted': 0, 'missing': [],
+        })
+        expected = expected_days(r, start, end)
+        submitted = min(r['submitted'], expected)
+        team['players'] += 1
+        team['expected'] += expected
+        team['submitted'] += submitted
+        if submitted < expected:
+            team['missing'].append({
+                'membership': r['id'],
+                'player': r['user_id'],
+                'player_name': f"{r['user__first_name']} {r['user__last_name']}".strip(),
+                'jersey_number': r['jersey_number'],
+                'submitted': submitted,
+                'missing_days': expected - submitted,
+            })
+
+    for team in teams.values():
+        team['rate'] = round(team['submitted'] / team['expected'], 4) if team['expected'] else None
+    return sorted(teams.values(), key=lambda t: t['team'])
@@ -0,0 +1,36 @@
+# wellness/management/commands/rebuild_wellness_baselines.py
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max, Min
+
+from teams.models import TeamMembership
+from wellness.baselines import refresh_wellness_baselines
+from wellness.models import DailyWellnessEntry
+
+
+class Command(BaseCommand):
+    help = "Recompute stored wellness baselines and z-scores (DailyWellnessEntry *_mean_28d / *_sd_28d / *_z)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--team", type=int, help="Team id (default: all players)")
+        parser.add_argument("--chunk-size", type=int, default=200, help="Players per batch")
+
+    def handle(self, *args, **opts):
+        if opts["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be >= 1.")
+        entries = DailyWellnessEntry.objects.all()
+        if opts["team"]:
+            entries = entries.filter(
+                player__in=TeamMembership.objects.filter(team_id=opts["team"]).values("user_id")
+            )
+        ranges = {
+            r["player_id"]: (r["first"], r["last"])
+            for r in entries.values("player_id").annotate(first=Min("entry_date"), last=Max("entry_date"))
+        }
+        ids = sorted(ranges)
+
+        size, written = opts["chunk_size"], 0
+        for i in range(0, len(ids), size):
+            with transaction.atomic():
+                written += refresh_wellness_baselines({p: ranges[p] for p in ids[i:i + size]})
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt baselines for {written} wellness entries."))
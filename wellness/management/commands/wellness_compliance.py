@@ -0,0 +1,40 @@
+# wellness/management/commands/wellness_compliance.py
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from teams.models import Team
+from wellness.compliance import MAX_RANGE_DAYS, compliance_report, period_range
+
+
+class Command(BaseCommand):
+    help = "Report wellness compliance per team: submission rate and the players with missing days."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--period", choices=["today", "week"], default="today")
+        parser.add_argument("--from", dest="start", help="YYYY-MM-DD (overrides --period)")
+        parser.add_argument("--to", dest="end", help="YYYY-MM-DD (default: today)")
+        parser.add_argument("--team", type=int, action="append", help="Team id, repeatable (default: all teams)")
+
+    def handle(self, *args, **opts):
+        start, end = period_range(opts["period"])
+        if opts["start"] or opts["end"]:
+            end = parse_date(opts["end"]) if opts["end"] else end
+            start = parse_date(opts["start"]) if opts["start"] else end
+            if start is None or end is None:
+                raise CommandError("Dates must be YYYY-MM-DD.")
+            if start > end or (end - start).days + 1 > MAX_RANGE_DAYS:
+                raise CommandError(f"--from must be on or before --to, at most {MAX_RANGE_DAYS} days apart.")
+        team_ids = opts["team"] or list(Team.objects.values_list("id", flat=True))
+
+        report = compliance_report(team_ids, start, end)
+        self.stdout.write(f"Wellness compliance {start} .. {end}")
+        for team in report:
+            rate = "n/a" if team["rate"] is None else f"{team['rate']:.0%}"
+            self.stdout.write(
+                f"{team['team_name']}: {rate} ({team['submitted']}/{team['expected']}), "
+                f"{len(team['missing'])} of {team['players']} players missing"
+            )
+            for p in team["missing"]:
+                self.stdout.write(f"  #{p['jersey_number'] or '-'} {p['player_name']}: {p['missing_days']} day(s) missing")
+        if not report:
+            self.stdout.write("No active players in scope.")
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-17 11:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wellness', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailywellnessentry',
+            name='fatigue_score_z',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='dailywellnessentry',
+            name='mood_score_z',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='dailywellnessentry',
+            name='sleep_quality_z',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='dailywellnessentry',
+            name='soreness_score_z',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
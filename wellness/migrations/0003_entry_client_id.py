@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-17 11:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wellness', '0002_entry_zscores'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailywellnessentry',
+            name='client_id',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='dailywellnessentry',
+            constraint=models.UniqueConstraint(fields=('player', 'client_id'), name='wellness_entry_player_client_id'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.7 on 2026-10-17 12:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wellness', '0003_entry_client_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailywellnessentry',
+            name='fatigue_score_mean_28d',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='dailywellnessentry',
+            name='fatigue_score_sd_28d',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='dailywellnessentry',
+            name='mood_score_mean_28d',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='dailywellnessentry',
+            name='mood_score_sd_28d',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='dailywellnessentry',
+            name='sleep_quality_mean_28d',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='dailywellnessentry',
+            name='sleep_quality_sd_28d',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='dailywellnessentry',
+            name='soreness_score_mean_28d',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='dailywellnessentry',
+            name='soreness_score_sd_28d',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
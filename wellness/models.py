@@ -25,9 +25,27 @@ class DailyWellnessEntry(models.Model):
     injury_description = models.TextField(null=True, blank=True)
     notes = models.TextField(null=True, blank=True)
     submitted_at = models.DateTimeField(auto_now_add=True)
+    client_id = models.CharField(max_length=64, null=True, blank=True)  # idempotency key of the app's offline queue
+    # Deviation from the player's own baseline (previous 28 days), kept by wellness.baselines
+    sleep_quality_z = models.FloatField(null=True, blank=True)
+    mood_score_z = models.FloatField(null=True, blank=True)
+    soreness_score_z = models.FloatField(null=True, blank=True)
+    fatigue_score_z = models.FloatField(null=True, blank=True)
+    # The baseline each z-score was computed from (mean / sample SD of the 28 days before entry_date)
+    sleep_quality_mean_28d = models.FloatField(null=True, blank=True)
+    sleep_quality_sd_28d = models.FloatField(null=True, blank=True)
+    mood_score_mean_28d = models.FloatField(null=True, blank=True)
+    mood_score_sd_28d = models.FloatField(null=True, blank=True)
+    soreness_score_mean_28d = models.FloatField(null=True, blank=True)
+    soreness_score_sd_28d = models.FloatField(null=True, blank=True)
+    fatigue_score_mean_28d = models.FloatField(null=True, blank=True)
+    fatigue_score_sd_28d = models.FloatField(null=True, blank=True)
 
     class Meta:
         unique_together = ('player', 'entry_date') # Ensures one entry per player per day
+        constraints = [
+            models.UniqueConstraint(fields=['player', 'client_id'], name='wellness_entry_player_client_id'),
+        ]
         ordering = ['-entry_date']
         verbose_name_plural = "Daily Wellness Entries"
 
@@ -1,35 +1,89 @@
-from django.db import models
-from django.conf import settings # To refer to AUTH_USER_MODEL
-
-class DailyWellnessEntry(models.Model):
-    SCORE_CHOICES = (
-        (1, '1 - Very Poor'),
-        (2, '2 - Poor'),
-        (3, '3 - Average'),
-        (4, '4 - Good'),
-        (5, '5 - Excellent'),
-    )
+from django.utils import timezone
+from rest_framework import serializers
 
-    player = models.ForeignKey(
-        settings.AUTH_USER_MODEL,
-        on_delete=models.CASCADE,
-        related_name='wellness_entries',
-        limit_choices_to={'role': 'PLAYER'}
-    )
-    entry_date = models.DateField()
-    sleep_quality = models.IntegerField(choices=SCORE_CHOICES)
-    mood_score = models.IntegerField(choices=SCORE_CHOICES)
-    soreness_score = models.IntegerField(choices=SCORE_CHOICES)
-    fatigue_score = models.IntegerField(choices=SCORE_CHOICES, null=True, blank=True) # Can be calculated or self-reported
-    injury_status = models.BooleanField(default=False)
-    injury_description = models.TextField(null=True, blank=True)
-    notes = models.TextField(null=True, blank=True)
-    submitted_at = models.DateTimeField(auto_now_add=True)
+from .baselines import BASELINE_FIELDS
+from .models import DailyWellnessEntry
+from .sync import SYNC_MAX_AGE_DAYS, SYNC_MAX_ENTRIES
+
+
+class DailyWellnessEntrySerializer(serializers.ModelSerializer):
+    player_name = serializers.CharField(source='player.get_full_name', read_only=True)
+
+    class Meta:
+        model = DailyWellnessEntry
+        fields = (
+            'id', 'player', 'player_name', 'entry_date',
+            'sleep_quality', 'mood_score', 'soreness_score', 'fatigue_score',
+            'injury_status', 'injury_description', 'notes', 'submitted_at',
+            'sleep_quality_z', 'mood_score_z', 'soreness_score_z', 'fatigue_score_z',
+            *BASELINE_FIELDS,
+        )
+        read_only_fields = (
+            'player', 'entry_date', 'submitted_at',
+            'sleep_quality_z', 'mood_score_z', 'soreness_score_z', 'fatigue_score_z',
+            *BASELINE_FIELDS,
+        )
 
+
+class TeamWellnessOverviewSerializer(serializers.Serializer):
+    """
+    One row per active squad player: their most recent entry with its stored
+    z-scores and baselines (null fields when they never submitted) and whether
+    today's entry is in.
+    """
+    membership = serializers.IntegerField()
+    player = serializers.IntegerField()
+    player_name = serializers.CharField()
+    jersey_number = serializers.IntegerField(allow_null=True)
+    entry_date = serializers.DateField(allow_null=True)
+    sleep_quality = serializers.IntegerField(allow_null=True)
+    mood_score = serializers.IntegerField(allow_null=True)
+    soreness_score = serializers.IntegerField(allow_null=True)
+    fatigue_score = serializers.IntegerField(allow_null=True)
+    sleep_quality_z = serializers.FloatField(allow_null=True)
+    mood_score_z = serializers.FloatField(allow_null=True)
+    soreness_score_z = serializers.FloatField(allow_null=True)
+    fatigue_score_z = serializers.FloatField(allow_null=True)
+    sleep_quality_mean_28d = serializers.FloatField(allow_null=True)
+    sleep_quality_sd_28d = serializers.FloatField(allow_null=True)
+    mood_score_mean_28d = serializers.FloatField(allow_null=True)
+    mood_score_sd_28d = serializers.FloatField(allow_null=True)
+    soreness_score_mean_28d = serializers.FloatField(allow_null=True)
+    soreness_score_sd_28d = serializers.FloatField(allow_null=True)
+    fatigue_score_mean_28d = serializers.FloatField(allow_null=True)
+    fatigue_score_sd_28d = serializers.FloatField(allow_null=True)
+    injury_status = serializers.BooleanField(allow_null=True)
+    submitted_at = serializers.DateTimeField(allow_null=True)
+    submitted_today = serializers.BooleanField()
+
+
+class WellnessSyncEntrySerializer(serializers.ModelSerializer):
+    """
+    One queued entry of an offline sync. client_id is the app's idempotency key.
+    """
     class Meta:
-        unique_together = ('player', 'entry_date') # Ensures one entry per player per day
-        ordering = ['-entry_date']
-        verbose_name_plural = "Daily Wellness Entries"
+        model = DailyWellnessEntry
+        fields = (
+            'client_id', 'entry_date',
+            'sleep_quality', 'mood_score', 'soreness_score', 'fatigue_score',
+            'injury_status', 'injury_description', 'notes',
+        )
+        extra_kwargs = {'client_id': {'required': True, 'allow_null': False, 'allow_blank': False}}
 
-    def __str__(self):
-        return f"{self.player.get_full_name()} - Wellness on {self.entry_date}"
\ No newline at end of file
+    def validate_entry_date(self, value):
+        today = timezone.localdate()
+        if value > today:
+            raise serializers.ValidationError("Cannot submit a future entry.")
+        if (today - value).days > SYNC_MAX_AGE_DAYS:
+            raise serializers.ValidationError(f"Entries older than {SYNC_MAX_AGE_DAYS} days cannot be synced.")
+        return value
+
+
+class WellnessSyncSerializer(serializers.Serializer):
+    """
+    Payload: {"entries": [{"client_id": "...", "entry_date": "YYYY-MM-DD", "sleep_quality": 4, ...}, ...]}
+    Items are validated one by one by the view, so one bad item does not block the queue.
+    """
+    entries = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False, max_length=SYNC_MAX_ENTRIES,
+    )
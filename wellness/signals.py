@@ -0,0 +1,47 @@
+# wellness/signals.py
+import threading
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from performance.series import add_range
+from performance.signals import on_commit_queued
+from .baselines import METRICS, refresh_wellness_baselines
+from .models import DailyWellnessEntry
+
+# Changed entry dates, flushed once per commit so a batch of submissions in one
+# transaction refreshes each player's baseline window once.
+_pending = threading.local()
+
+def _pending_ranges(fresh=False):
+    if fresh or not hasattr(_pending, 'ranges'):
+        _pending.ranges = {}  # player_id -> (first, last) changed entry_date
+    return _pending.ranges
+
+def _flush_pending():
+    ranges = _pending_ranges()
+    if not ranges:
+        return
+    _pending.ranges = {}
+    with transaction.atomic():
+        refresh_wellness_baselines(ranges)
+
+def schedule_baseline_refresh(player_id, entry_date):
+    # No flush queued: new transaction, or leftovers of a rolled-back one to drop
+    queued = on_commit_queued(_flush_pending)
+    add_range(_pending_ranges(fresh=not queued), player_id, entry_date, entry_date)
+    if not queued:
+        transaction.on_commit(_flush_pending)
+
+@receiver(post_save, sender=DailyWellnessEntry)
+def on_wellness_entry_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:  # fixture loading
+        return
+    if update_fields and not set(update_fields) & {'entry_date', *METRICS}:
+        return
+    schedule_baseline_refresh(instance.player_id, sender._meta.get_field('entry_date').to_python(instance.entry_date))
+
+@receiver(post_delete, sender=DailyWellnessEntry)
+def on_wellness_entry_delete(sender, instance, **kwargs):
+    schedule_baseline_refresh(instance.player_id, sender._meta.get_field('entry_date').to_python(instance.entry_date))
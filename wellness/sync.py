@@ -0,0 +1,102 @@
+# wellness/sync.py
+"""
+Bulk sync of a player's offline wellness queue.
+
+Every queued entry carries a client idempotency key (client_id). Keys already
+stored are reported as duplicates and not written again, so replaying a queue
+after a dropped connection is harmless. Everything else is upserted in one
+statement against the (player, entry_date) unique constraint; when the queue
+holds several entries for the same day, the last one in queue order wins. An
+update only overwrites the fields the client sent, so omitted optional fields
+keep their stored values.
+"""
+from django.db import transaction
+from django.db.models import Q
+
+from .models import DailyWellnessEntry
+from .signals import schedule_baseline_refresh
+
+SYNC_MAX_ENTRIES = 31   # per request
+SYNC_MAX_AGE_DAYS = 7   # oldest entry_date accepted, in days before today
+
+CREATED = 'created'
+UPDATED = 'updated'
+DUPLICATE = 'duplicate'    # client_id already synced
+SUPERSEDED = 'superseded'  # a later queued entry for the same day won
+REJECTED = 'rejected'      # failed validation
+
+WRITE_FIELDS = (
+    'sleep_quality', 'mood_score', 'soreness_score', 'fatigue_score',
+    'injury_status', 'injury_description', 'notes', 'client_id',
+)
+
+
+def sync_entries(player, items):
+    """
+    items: validated WellnessSyncEntrySerializer data in queue order.
+    Returns one {client_id, entry_date, status, id} per item, in order.
+    Three queries whatever the batch size (existing keys/days, the upsert, the
+    ids read back) plus one baseline refresh on commit; entries that send
+    different sets of optional fields are upserted in one statement per set.
+    """
+    keys = [item['client_id'] for item in items]
+    dates = [item['entry_date'] for item in items]
+    stored_key, stored_date = {}, {}
+    for row in DailyWellnessEntry.objects.filter(
+        Q(client_id__in=keys) | Q(entry_date__in=dates), player=player,
+    ).values('id', 'client_id', 'entry_date'):
+        stored_key[row['client_id']] = row
+        stored_date[row['entry_date']] = row
+
+    results = [{'client_id': k, 'entry_date': d, 'status': None, 'id': None} for k, d in zip(keys, dates)]
+    # The last entry per day in queue order wins, counting already-synced ones:
+    # a replayed queue must not let an older entry overwrite a newer day.
+    seen, last = {}, {}  # client_id -> its entry_date; entry_date -> last item
+    repeat = set()
+    for i, item in enumerate(items):
+        if item['client_id'] in seen:
+            repeat.add(i)
+            continue
+        seen[item['client_id']] = item['entry_date']
+        last[item['entry_date']] = i
+
+    winner = {}  # entry_date -> item to write
+    for i, item in enumerate(items):
+        if i in repeat or item['client_id'] in stored_key:
+            results[i]['status'] = DUPLICATE
+        elif last[item['entry_date']] != i:
+            results[i]['status'] = SUPERSEDED
+        else:
+            winner[item['entry_date']] = i
+
+    by_fields = {}  # fields sent -> rows; an update must not reset what was left out
+    for day, i in winner.items():
+        results[i]['status'] = UPDATED if day in stored_date else CREATED
+        sent = tuple(f for f in WRITE_FIELDS if f in items[i])
+        by_fields.setdefault(sent, []).append(DailyWellnessEntry(
+            player=player, entry_date=day, **{f: items[i][f] for f in sent},
+        ))
+    if by_fields:
+        with transaction.atomic():
+            for sent, rows in by_fields.items():
+                DailyWellnessEntry.objects.bulk_create(
+                    rows,
+                    update_conflicts=True,
+                    unique_fields=['player', 'entry_date'],
+                    update_fields=list(sent),
+                )
+                # bulk_create sends no post_save; queue the baseline refresh explicitly
+                for row in rows:
+                    schedule_baseline_refresh(player.pk, row.entry_date)
+
+    written = dict(
+        DailyWellnessEntry.objects.filter(player=player, entry_date__in=list(set(seen.values())))
+        .values_list('entry_date', 'id')
+    ) if seen else {}
+    for r in results:
+        if r['status'] == DUPLICATE:
+            stored = stored_key.get(r['client_id'])
+            r['id'] = stored['id'] if stored else written.get(seen[r['client_id']])
+        elif r['status'] != SUPERSEDED:
+            r['id'] = written.get(r['entry_date'])
+    return results
@@ -1,17 +1,23 @@
 from django.urls import path
 from .views import (
     PlayerWellnessEntryView,
+    PlayerWellnessSyncView,
     PlayerWellnessDetailUpdateView,
     TeamWellnessOverviewListView,
+    TeamWellnessHeatmapView,
+    WellnessComplianceView,
     PlayerWellnessHistoryView
 )
 
 urlpatterns = [
     # Player specific views
     path('mine/', PlayerWellnessEntryView.as_view(), name='player_wellness_list_create'),
+    path('mine/sync/', PlayerWellnessSyncView.as_view(), name='player_wellness_sync'),
     path('mine/<str:entry_date>/', PlayerWellnessDetailUpdateView.as_view(), name='player_wellness_detail_update'), # Format YYYY-MM-DD
 
     # Coach/Admin specific views
     path('team/', TeamWellnessOverviewListView.as_view(), name='team_wellness_overview'), # For listing today's wellness for all players
+    path('team/heatmap/', TeamWellnessHeatmapView.as_view(), name='team_wellness_heatmap'),
+    path('compliance/', WellnessComplianceView.as_view(), name='wellness_compliance'),
     path('player/<int:player_id>/history/', PlayerWellnessHistoryView.as_view(), name='player_wellness_history'),
 ]
\ No newline at end of file
@@ -1,17 +1,48 @@
-from rest_framework import generics
+from rest_framework import generics, serializers
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
+from django.http import Http404
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.db import IntegrityError
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
 from datetime import date, timedelta
 
+from performance.columnar import date_axis, date_range_from_request, dense_matrix, matrix_to_json
+from .baselines import BASELINE_FIELDS, METRICS, Z_FIELDS
+from .compliance import MAX_RANGE_DAYS, compliance_report, period_range, visible_team_ids
 from .models import DailyWellnessEntry
-from .serializers import DailyWellnessEntry, TeamWellnessOverviewSerializer
+from .serializers import (
+    DailyWellnessEntrySerializer, TeamWellnessOverviewSerializer,
+    WellnessSyncEntrySerializer, WellnessSyncSerializer,
+)
+from .sync import REJECTED, sync_entries
+from teams.models import Team, TeamMembership
 from users.permissions import IsPlayer, IsCoachOrAdmin, IsOwnerOrCoachOrAdmin # Adjust import path
 
+
+def resolve_team(request):
+    """
+    The team from ?team=<id>, or the requester's only active team.
+    Object permissions are left to the view.
+    """
+    team_id = request.query_params.get('team')
+    if team_id:
+        if not team_id.isdigit():
+            raise ValidationError({"team": "Must be a team id."})
+        return get_object_or_404(Team, pk=team_id)
+    team_ids = list(
+        TeamMembership.objects.filter(user=request.user, active=True).values_list('team_id', flat=True).distinct()
+    )
+    if len(team_ids) != 1:
+        raise ValidationError({"team": "Specify team (you have multiple/zero active teams)."})
+    return Team.objects.get(pk=team_ids[0])
+
 class PlayerWellnessEntryView(generics.ListCreateAPIView):
-    serializer_class = DailyWellnessEntry
+    serializer_class = DailyWellnessEntrySerializer
     permission_classes = [IsAuthenticated, IsPlayer]
 
     def get_queryset(self):
@@ -23,11 +54,54 @@ class PlayerWellnessEntryView(generics.ListCreateAPIView):
         today = date.today()
         if DailyWellnessEntry.objects.filter(player=self.request.user, entry_date=today).exists():
             raise serializers.ValidationError({"detail": "You have already submitted a wellness entry for today."})
-        serializer.save(player=self.request.user, entry_date=today)
+        entry = serializer.save(player=self.request.user, entry_date=today)
+        entry.refresh_from_db(fields=Z_FIELDS + BASELINE_FIELDS)  # set by wellness.signals on commit
+
+class PlayerWellnessSyncView(generics.GenericAPIView):
+    """
+    POST /api/wellness/mine/sync/
+    Drains the app's offline queue: several dated entries, each with a client
+    idempotency key, upserted in one statement on (player, entry_date).
+    Returns one result per queued item, in order, with status
+    created / updated / duplicate / superseded / rejected; invalid items are
+    rejected individually and never block the rest of the queue.
+    Players only, for their own entries.
+    """
+    serializer_class = WellnessSyncSerializer
+    permission_classes = [IsAuthenticated, IsPlayer]
+
+    def post(self, request, *args, **kwargs):
+        ser = self.get_serializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+
+        results, valid, positions = [], [], []
+        for i, raw in enumerate(ser.validated_data["entries"]):
+            item = WellnessSyncEntrySerializer(data=raw)
+            if item.is_valid():
+                valid.append(item.validated_data)
+                positions.append(i)
+                results.append(None)
+            else:
+                results.append({
+                    "client_id": raw.get("client_id"), "entry_date": raw.get("entry_date"),
+                    "status": REJECTED, "id": None, "errors": item.errors,
+                })
+        try:
+            synced = sync_entries(request.user, valid) if valid else []
+        except IntegrityError:
+            # The same client_id queued for two different days
+            return Response({"detail": "A client_id was reused for another entry."}, status=status.HTTP_409_CONFLICT)
+        for i, result in zip(positions, synced):
+            results[i] = result
+
+        summary = {}
+        for r in results:
+            summary[r["status"]] = summary.get(r["status"], 0) + 1
+        return Response({"results": results, "summary": summary}, status=status.HTTP_200_OK)
 
 class PlayerWellnessDetailUpdateView(generics.RetrieveUpdateAPIView):
     queryset = DailyWellnessEntry.objects.all()
-    serializer_class = DailyWellnessEntry
+    serializer_class = DailyWellnessEntrySerializer
     permission_classes = [IsAuthenticated, IsOwnerOrCoachOrAdmin] # Player can update their own, coach/admin can update their team's
 
     def get_object(self):
@@ -51,32 +125,171 @@ class PlayerWellnessDetailUpdateView(generics.RetrieveUpdateAPIView):
             return Response({"detail": "Cannot update past wellness entries."}, status=status.HTTP_403_FORBIDDEN)
         return super().update(request, *args, **kwargs)
 
+    def perform_update(self, serializer):
+        entry = serializer.save()
+        entry.refresh_from_db(fields=Z_FIELDS + BASELINE_FIELDS)  # set by wellness.signals on commit
+
 
 class TeamWellnessOverviewListView(generics.ListAPIView):
+    """
+    GET /api/wellness/team/?team=<team_id>
+    Each active squad player's most recent DailyWellnessEntry (null fields when
+    they never submitted) plus `submitted_today`. The team is resolved through
+    TeamMembership: ?team=, or the requester's only active team.
+    One query: memberships LEFT JOIN entries, ROW_NUMBER() per membership over
+    entry_date DESC, first row kept. The (player, entry_date) unique index
+    serves the join and the ordering.
+    Coach/Owner/Admin of the team only.
+    """
     serializer_class = TeamWellnessOverviewSerializer
-    permission_classes = [IsAuthenticated, IsCoachOrAdmin] # Only coaches/admins can see team overview
-    filterset_fields = ['entry_date'] # Allow filtering by date
+    permission_classes = [IsAuthenticated, IsOwnerOrCoachOrAdmin]  # checked on the resolved team
+    pagination_class = None  # one row per squad player
 
     def get_queryset(self):
-        # Coaches/Admins can see the latest wellness entry for all players in their team
-        team = self.request.user.team
-        if not team:
-            return DailyWellnessEntry.objects.none()
+        team = resolve_team(self.request)
+        self.check_object_permissions(self.request, team)
+
+        entry = 'user__wellness_entries__'
+        fields = ('entry_date', 'sleep_quality', 'mood_score', 'soreness_score',
+                  'fatigue_score', *Z_FIELDS, *BASELINE_FIELDS, 'injury_status', 'submitted_at')
+        return (
+            TeamMembership.objects
+            .filter(team=team, active=True, role_on_team='PLAYER')
+            .annotate(
+                row=Window(RowNumber(), partition_by=F('id'),
+                           order_by=F(entry + 'entry_date').desc(nulls_last=True)),
+                **{f: F(entry + f) for f in fields},
+            )
+            .filter(row=1)
+            .order_by('jersey_number', 'id')
+            .values('id', 'user_id', 'user__first_name', 'user__last_name', 'jersey_number', *fields)
+        )
+
+    def list(self, request, *args, **kwargs):
+        today = timezone.localdate()
+        rows = [
+            {
+                **r,
+                'membership': r['id'],
+                'player': r['user_id'],
+                'player_name': f"{r['user__first_name']} {r['user__last_name']}".strip(),
+                'submitted_today': r['entry_date'] == today,
+            }
+            for r in self.get_queryset()
+        ]
+        return Response(self.get_serializer(rows, many=True).data)
+
+
+HEATMAP_DEFAULT_DAYS = 14
+HEATMAP_MAX_DAYS = 28
+
+
+class TeamWellnessHeatmapView(generics.GenericAPIView):
+    """
+    GET /api/wellness/team/heatmap/?team=<team_id>&days=14&metrics=sleep_quality,mood_score_z
+    Dense players x days matrix per metric over the last `days` days (up to
+    today, at most 28): a `dates` axis, a `players` axis and per metric one
+    array per player, null where no entry was submitted. Metrics are the four
+    scores (default) and/or their stored z-scores.
+    One query for the squad and one range query for the entries.
+    Coach/Owner/Admin of the team only.
+    """
+    permission_classes = [IsAuthenticated, IsOwnerOrCoachOrAdmin]  # checked on the resolved team
+
+    def get(self, request, *args, **kwargs):
+        team = resolve_team(request)
+        self.check_object_permissions(request, team)
+
+        days = request.query_params.get("days", str(HEATMAP_DEFAULT_DAYS))
+        if not days.isdigit() or not 1 <= int(days) <= HEATMAP_MAX_DAYS:
+            return Response({"detail": f"days must be 1..{HEATMAP_MAX_DAYS}."}, status=400)
+        metrics = request.query_params.get("metrics", ",".join(METRICS)).split(",")
+        unknown = [m for m in metrics if m not in METRICS and m not in Z_FIELDS]
+        if unknown:
+            return Response({"detail": f"Unknown metrics: {', '.join(unknown)}."}, status=400)
+
+        end = timezone.localdate()
+        start = end - timedelta(days=int(days) - 1)
+        members = list(
+            TeamMembership.objects
+            .filter(team=team, active=True, role_on_team='PLAYER')
+            .order_by('jersey_number', 'id')
+            .values('id', 'user_id', 'user__first_name', 'user__last_name', 'jersey_number')
+        )
+        players = [m['user_id'] for m in members]
+        rows = (
+            DailyWellnessEntry.objects
+            .filter(player_id__in=players, entry_date__range=(start, end))
+            .values_list('player_id', 'entry_date', *metrics)
+        )
+        matrix = dense_matrix(rows, players, start, int(days), len(metrics))
+
+        data = {}
+        for metric, values in zip(metrics, matrix):
+            cells = matrix_to_json(values, decimals=3)
+            if metric in METRICS:  # raw 1..5 scores stay integers
+                cells = [[None if v is None else int(v) for v in row] for row in cells]
+            data[metric] = cells
+        return Response({
+            "team": team.id,
+            "dates": date_axis(start, end),
+            "players": [
+                {
+                    "membership": m['id'],
+                    "player": m['user_id'],
+                    "name": f"{m['user__first_name']} {m['user__last_name']}".strip(),
+                    "jersey_number": m['jersey_number'],
+                }
+                for m in members
+            ],
+            **data,
+        })
+
+
+class WellnessComplianceView(generics.GenericAPIView):
+    """
+    GET /api/wellness/compliance/?period=today|week  or  ?from=YYYY-MM-DD&to=YYYY-MM-DD  [&team=<id>]
+    Per team: active players, expected and actual submissions, the compliance
+    rate and the players with missing days, for every team the requester
+    coaches or owns (admins: all teams). One query for all teams.
+    """
+    permission_classes = [IsAuthenticated]  # visible_team_ids scopes the teams
+
+    def get(self, request, *args, **kwargs):
+        params = request.query_params
+        try:
+            if params.get("from") or params.get("to"):
+                start, end = date_range_from_request(request, default_days=1)
+                if (end - start).days + 1 > MAX_RANGE_DAYS:
+                    raise ValueError(f"Range is limited to {MAX_RANGE_DAYS} days.")
+            else:
+                start, end = period_range(params.get("period", "today"))
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=400)
 
-        # Get the latest entry for each player in the team
-        # This is a bit complex for default Django ORM, might need raw SQL or a subquery
-        # For simplicity in MVP, let's get all entries for the team and let the frontend filter,
-        # or filter for a specific date (e.g., today)
-        entry_date = self.request.query_params.get('entry_date', str(date.today()))
-        return DailyWellnessEntry.objects.filter(player__team=team, entry_date=entry_date).select_related('player')
+        team_ids = visible_team_ids(request.user)
+        team_id = params.get("team")
+        if team_id:
+            if not team_id.isdigit() or int(team_id) not in team_ids:
+                return Response({"detail": "Unknown team."}, status=404)
+            team_ids = [int(team_id)]
+        return Response({"from": start, "to": end, "teams": compliance_report(team_ids, start, end)})
 
 
 class PlayerWellnessHistoryView(generics.ListAPIView):
-    serializer_class = DailyWellnessEntry
+    serializer_class = DailyWellnessEntrySerializer
     permission_classes = [IsAuthenticated, IsCoachOrAdmin] # Coaches/Admins can view player history
 
     def get_queryset(self):
         player_id = self.kwargs['player_id']
-        # Ensure the player belongs to the coach's team
-        player = get_object_or_404(self.request.user.team.members.filter(role='PLAYER'), pk=player_id)
-        return DailyWellnessEntry.objects.filter(player=player).order_by('-entry_date')
\ No newline at end of file
+        # Ensure the player belongs to one of the coach's teams
+        memberships = TeamMembership.objects.filter(user_id=player_id, role_on_team='PLAYER', active=True)
+        if not self.request.user.is_admin():
+            memberships = memberships.filter(
+                team__memberships__user=self.request.user,
+                team__memberships__role_on_team='COACH',
+                team__memberships__active=True,
+            )
+        if not memberships.exists():
+            raise Http404("Player not found in your teams.")
+        return DailyWellnessEntry.objects.filter(player_id=player_id).order_by('-entry_date')